@@ -4,13 +4,14 @@ Job Matcher & Resume Analyzer - Main Streamlit Application
 
 import streamlit as st
 import sys
-sys.path.append('.')
+import hashlib
+import threading
+if '.' not in sys.path:
+    sys.path.append('.')
 
 from utils.pdf_extractor import extract_text_from_uploaded_file
-from models.matcher import calculate_match_score, generate_match_insights, generate_recommendations
-from models.ats_checker import check_ats_compatibility, generate_ats_improvements
-from utils.visualization import *
 from utils.data_loader import load_sample_resumes, load_sample_jobs
+from config.paths import SKILLS_DATABASE
 from config.settings import *
 
 # ==========================================
@@ -63,6 +64,47 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# ==========================================
+# MODEL WARM-UP
+# ==========================================
+
+@st.cache_resource(show_spinner=False)
+def start_model_warmup():
+    """
+    Load Sentence-BERT and the skills automaton on a background thread
+    
+    Runs once per server process, so the first Analyze click finds the
+    cached resources already loaded
+    """
+    def warm_up():
+        try:
+            from models.matcher import load_sentence_transformer
+            from models.skill_extractor import load_skill_automaton
+            load_sentence_transformer()
+            load_skill_automaton()
+        except Exception as e:
+            print(f"⚠️  Model warm-up failed: {e}")
+    
+    thread = threading.Thread(target=warm_up, name="model-warmup", daemon=True)
+    thread.start()
+    return thread
+
+# ==========================================
+# CACHED ANALYSIS
+# ==========================================
+
+@st.cache_data(ttl=24*60*60, show_spinner=False)
+def cached_match_score(resume_text, job_text):
+    """Match score for a (resume, job) pair, reused across reruns"""
+    from models.matcher import calculate_match_score
+    return calculate_match_score(resume_text, job_text)
+
+@st.cache_data(ttl=24*60*60, show_spinner=False)
+def cached_ats_check(resume_text, job_text):
+    """ATS report for a (resume, job) pair, reused across reruns"""
+    from models.ats_checker import check_ats_compatibility
+    return check_ats_compatibility(resume_text, job_text)
+
 # ==========================================
 # MAIN APP
 # ==========================================
@@ -72,6 +114,10 @@ def main():
     st.markdown("# 💼 AI Job Matcher & Resume Analyzer")
     st.markdown("### Match your resume with job descriptions using AI")
     
+    # The skill loaders only log a missing database, so warn in the UI here
+    if not SKILLS_DATABASE.exists():
+        st.warning(f"⚠️ Skills database not found: {SKILLS_DATABASE}")
+    
     # Sidebar
     with st.sidebar:
         st.markdown("## 🎯 How It Works")
@@ -122,7 +168,12 @@ def main():
             if resume_file:
                 with st.spinner("📖 Extracting text from resume..."):
                     try:
-                        resume_text = extract_text_from_uploaded_file(resume_file)
+                        # Reruns keep the same upload, so only extract when the file changes
+                        file_hash = hashlib.sha1(resume_file.getvalue()).hexdigest()
+                        if st.session_state.get('resume_file_hash') != file_hash:
+                            st.session_state['resume_text'] = extract_text_from_uploaded_file(resume_file)
+                            st.session_state['resume_file_hash'] = file_hash
+                        resume_text = st.session_state['resume_text']
                         st.success(f"✅ Resume loaded ({len(resume_text)} characters)")
                         
                         with st.expander("👀 Preview Resume Text"):
@@ -165,11 +216,19 @@ def main():
                 # Main analysis
                 with st.spinner("🤖 AI is analyzing... This may take 30-60 seconds..."):
                     try:
+                        # Heavy modules (torch, Sentence-BERT, Plotly) load on first use
+                        from models.matcher import generate_match_insights, generate_recommendations
+                        from models.ats_checker import generate_ats_improvements
+                        from utils.visualization import (
+                            create_score_gauge, create_score_breakdown, create_radar_chart,
+                            create_skills_comparison, create_ats_chart
+                        )
+                        
                         # Calculate match
-                        result = calculate_match_score(resume_text, job_text)
+                        result = cached_match_score(resume_text, job_text)
                         
                         # Check ATS
-                        ats_result = check_ats_compatibility(resume_text, job_text)
+                        ats_result = cached_ats_check(resume_text, job_text)
                         
                         st.success("✅ Analysis Complete!")
                         
@@ -208,7 +267,7 @@ def main():
                             )
                             st.metric(
                                 "Experience",
-                                f"{result['resume']['years_of_experience']} years"
+                                f"{result['resume'].years_of_experience} years"
                             )
                         
                         # Score breakdown
@@ -256,30 +315,26 @@ def main():
                         with skill_col1:
                             st.markdown("#### ✅ Skills You Have")
                             if result['matching_skills']:
-                                for skill in result['matching_skills'][:10]:
-                                    st.markdown(f"- {skill}")
+                                st.markdown("\n".join(f"- {skill}" for skill in result['matching_skills'][:10]))
                             else:
                                 st.info("No matching skills found")
                         
                         with skill_col2:
                             st.markdown("#### ⚠️ Missing Skills")
                             if result['missing_skills']:
-                                for skill in result['missing_skills'][:10]:
-                                    st.markdown(f"- {skill}")
+                                st.markdown("\n".join(f"- {skill}" for skill in result['missing_skills'][:10]))
                             else:
                                 st.success("You have all required skills!")
                         
                         # Insights
                         st.markdown("### 💡 AI Insights")
                         insights = generate_match_insights(result)
-                        for insight in insights:
-                            st.info(insight)
+                        st.info("\n\n".join(insights))
                         
                         # Recommendations
                         st.markdown("### 📋 Recommendations")
                         recommendations = generate_recommendations(result)
-                        for rec in recommendations:
-                            st.success(rec)
+                        st.success("\n\n".join(recommendations))
                         
                         # ATS Analysis
                         st.markdown("### 🤖 ATS Compatibility")
@@ -292,20 +347,17 @@ def main():
                         
                         if ats_result['issues']:
                             st.error("**Issues Found:**")
-                            for issue in ats_result['issues']:
-                                st.markdown(f"- {issue}")
+                            st.markdown("\n".join(f"- {issue}" for issue in ats_result['issues']))
                         
                         if ats_result['warnings']:
                             st.warning("**Warnings:**")
-                            for warning in ats_result['warnings']:
-                                st.markdown(f"- {warning}")
+                            st.markdown("\n".join(f"- {warning}" for warning in ats_result['warnings']))
                         
                         # ATS Improvements
                         improvements = generate_ats_improvements(ats_result)
                         if improvements:
                             with st.expander("🔧 View ATS Improvements"):
-                                for imp in improvements:
-                                    st.markdown(imp)
+                                st.markdown("\n\n".join(improvements))
                         
                         # Detailed analysis (optional)
                         if show_details:
@@ -316,8 +368,8 @@ def main():
                                     'skills_score': result['skills_score'],
                                     'experience_score': result['experience_score'],
                                     'education_score': result['education_score'],
-                                    'resume_word_count': result['resume']['word_count'],
-                                    'job_word_count': result['job']['word_count']
+                                    'resume_word_count': result['resume'].word_count,
+                                    'job_word_count': result['job'].word_count
                                 })
                     
                     except Exception as e:
@@ -395,4 +447,5 @@ if __name__ == "__main__":
     if 'use_sample' not in st.session_state:
         st.session_state['use_sample'] = False
     
+    start_model_warmup()
     main()
\ No newline at end of file
@@ -53,6 +53,9 @@ SENTENCE_TRANSFORMER_MODEL = "all-MiniLM-L6-v2"  # Will be downloaded
 SPACY_MODEL_DIR = MODELS_DIR / "spacy_model"
 SPACY_MODEL_NAME = "en_core_web_sm"
 
+# Embedding cache (Sentence-BERT vectors keyed by text hash)
+EMBEDDING_CACHE_DIR = MODELS_DIR / "embedding_cache"
+
 # GPT-2 Model (for suggestions)
 GPT2_MODEL_DIR = MODELS_DIR / "gpt2_model"
 GPT2_MODEL_NAME = "distilgpt2"
@@ -74,6 +77,7 @@ def ensure_directories():
         MODELS_DIR,
         SENTENCE_TRANSFORMER_DIR,
         SPACY_MODEL_DIR,
+        EMBEDDING_CACHE_DIR,
         GPT2_MODEL_DIR
     ]
     
@@ -138,17 +142,40 @@ def get_processed_job_file(sample=True):
         Path: Path to the job file
     """
     if sample:
-        if LINKEDIN_JOBS_SAMPLE.exists():
-            return LINKEDIN_JOBS_SAMPLE
+        job_file = find_processed_file(LINKEDIN_JOBS_SAMPLE)
+        if job_file:
+            return job_file
         else:
             print("⚠️  Sample file not found, using light file")
-            return LINKEDIN_JOBS_LIGHT
+            return find_processed_file(LINKEDIN_JOBS_LIGHT) or LINKEDIN_JOBS_LIGHT
     else:
-        if LINKEDIN_JOBS_FULL.exists():
-            return LINKEDIN_JOBS_FULL
+        job_file = find_processed_file(LINKEDIN_JOBS_FULL)
+        if job_file:
+            return job_file
         else:
             print("⚠️  Full file not found, using sample file")
-            return LINKEDIN_JOBS_SAMPLE
+            return find_processed_file(LINKEDIN_JOBS_SAMPLE) or LINKEDIN_JOBS_SAMPLE
+
+def find_processed_file(csv_path):
+    """
+    Find a processed dataset on disk, preferring its Parquet copy
+    
+    Args:
+        csv_path (Path): CSV path of the processed file
+    
+    Returns:
+        Path: The .parquet file if present, else the directory of Parquet
+              parts written by the chunked processor, else the CSV, else None
+    """
+    parquet_path = csv_path.with_suffix('.parquet')
+    if parquet_path.exists():
+        return parquet_path
+    parts_dir = csv_path.with_suffix('')
+    if parts_dir.is_dir() and any(parts_dir.glob('part-*.parquet')):
+        return parts_dir
+    if csv_path.exists():
+        return csv_path
+    return None
 
 # ==========================================
 # USAGE EXAMPLE
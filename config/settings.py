@@ -40,8 +40,14 @@ MAX_PDF_PAGES = 10                 # Maximum pages to extract from PDF
 
 # Sentence Transformer
 SENTENCE_TRANSFORMER_MODEL = "all-MiniLM-L6-v2"
+SENTENCE_TRANSFORMER_BACKEND = "torch"  # "torch", "torch-int8" (CPU) or "onnx" (needs sentence-transformers[onnx])
+ONNX_MODEL_FILE = "onnx/model_qint8_avx512_vnni.onnx"  # int8-quantized export (VNNI CPUs)
 EMBEDDING_BATCH_SIZE = 32
-MAX_SEQ_LENGTH = 512
+EMBEDDING_MEMORY_CACHE_SIZE = 2048  # Embeddings kept in RAM in front of the disk cache
+EMBEDDING_DISK_CACHE_MAX_FILES = 100_000  # Cached .npy files per model before the oldest are pruned
+# Tokens per text. 256 is all-MiniLM-L6-v2's own limit, so the default changes
+# nothing; lower it (e.g. 128) to trade tail-of-text context for encode speed
+MAX_SEQ_LENGTH = 256
 
 # spaCy NER
 SPACY_MODEL = "en_core_web_sm"
@@ -91,6 +97,8 @@ MAX_RESUMES_TO_LOAD = 1000         # For batch processing
 USE_GPU = False                    # Use GPU if available (set True if you have CUDA)
 NUM_WORKERS = 4                    # Parallel processing workers
 BATCH_PROCESSING = True            # Process multiple items at once
+PROCESS_POOL_MIN_JOBS = 200        # Parse batches at least this large in worker processes
+PARSED_JOB_CACHE_SIZE = 1024       # Parsed job descriptions kept in memory
 
 # ==========================================
 # LOGGING
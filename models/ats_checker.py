@@ -2,11 +2,20 @@
 ATS Checker - Check Applicant Tracking System compatibility
 """
 
+import re
 import sys
-sys.path.append('.')
-from utils.text_processor import get_word_count, detect_sections, extract_keywords
+from itertools import islice
+if '.' not in sys.path:
+    sys.path.append('.')
+from utils.text_processor import analyze_text, extract_keywords
 from config.settings import *
 
+# Fancy bullets and symbols that ATS parsers often mangle
+_SPECIAL_CHARS_RE = re.compile('[★●◆▪✓→]')
+
+# A line longer than 200 characters (one match per such line)
+_LONG_LINE_RE = re.compile(r'[^\n]{201,}')
+
 # ==========================================
 # ATS COMPATIBILITY CHECK
 # ==========================================
@@ -30,8 +39,11 @@ def check_ats_compatibility(resume_text: str, job_text: str = None) -> dict:
         'checks': {}
     }
     
+    # Word count, sections and keywords of the resume, computed once
+    features = analyze_text(resume_text)
+    
     # 1. Word Count Check
-    word_count = get_word_count(resume_text)
+    word_count = features.word_count
     if word_count < ATS_MIN_WORD_COUNT:
         report['ats_score'] -= 15
         report['issues'].append(f"Resume too short ({word_count} words, minimum {ATS_MIN_WORD_COUNT})")
@@ -42,7 +54,7 @@ def check_ats_compatibility(resume_text: str, job_text: str = None) -> dict:
         report['checks']['word_count'] = '✅ Good length'
     
     # 2. Section Headers Check
-    sections = detect_sections(resume_text)
+    sections = features.sections
     missing_sections = []
     
     for required_section in ATS_REQUIRED_SECTIONS:
@@ -57,7 +69,7 @@ def check_ats_compatibility(resume_text: str, job_text: str = None) -> dict:
     
     # 3. Keyword Density (if job provided)
     if job_text:
-        keyword_score = check_keyword_density(resume_text, job_text)
+        keyword_score = check_keyword_density(resume_text, job_text, resume_keywords=features.keywords)
         report['keyword_density'] = keyword_score
         
         if keyword_score < ATS_MIN_KEYWORD_DENSITY:
@@ -99,23 +111,31 @@ def check_ats_compatibility(resume_text: str, job_text: str = None) -> dict:
 # KEYWORD DENSITY
 # ==========================================
 
-def check_keyword_density(resume_text: str, job_text: str) -> float:
+def check_keyword_density(resume_text: str, job_text: str, resume_keywords=None) -> float:
     """
     Check keyword overlap between resume and job
     
+    Args:
+        resume_text: Resume text
+        job_text: Job description text
+        resume_keywords: Top-30 resume keywords, if already extracted
+    
     Returns:
         Keyword density score (0-1)
     """
-    # Extract keywords from both
-    resume_keywords = set(extract_keywords(resume_text, top_n=30))
-    job_keywords = set(extract_keywords(job_text, top_n=30))
+    # Extract keywords from both (keywords are unique, so only the
+    # resume side needs a set for membership tests)
+    if resume_keywords is None:
+        resume_keywords = extract_keywords(resume_text, top_n=30)
+    resume_keywords = set(resume_keywords)
+    job_keywords = extract_keywords(job_text, top_n=30)
     
     if not job_keywords:
         return 1.0
     
     # Calculate overlap
-    matched = resume_keywords & job_keywords
-    density = len(matched) / len(job_keywords)
+    matched = sum(1 for keyword in job_keywords if keyword in resume_keywords)
+    density = matched / len(job_keywords)
     
     return density
 
@@ -137,8 +157,7 @@ def check_formatting(text: str) -> list:
         issues.append("⚠️ Possible tables detected (ATS may not parse correctly)")
     
     # Check for special characters
-    special_chars = ['★', '●', '◆', '▪', '✓', '→']
-    if any(char in text for char in special_chars):
+    if _SPECIAL_CHARS_RE.search(text):
         issues.append("⚠️ Special characters detected (use standard bullets)")
     
     # Check for headers/footers patterns
@@ -146,9 +165,9 @@ def check_formatting(text: str) -> list:
         issues.append("⚠️ Possible headers/footers (remove before submitting)")
     
     # Check line length (extremely long lines might indicate formatting issues)
-    lines = text.split('\n')
-    very_long_lines = [l for l in lines if len(l) > 200]
-    if len(very_long_lines) > 5:
+    # Stops scanning as soon as the sixth long line is found
+    very_long_lines = sum(1 for _ in islice(_LONG_LINE_RE.finditer(text), 6))
+    if very_long_lines > 5:
         issues.append("⚠️ Very long lines detected (check formatting)")
     
     return issues
@@ -3,17 +3,103 @@ Job Analyzer - Extract structured info from job descriptions
 """
 
 import sys
-sys.path.append('.')
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+if '.' not in sys.path:
+    sys.path.append('.')
 from utils.text_processor import *
-from models.skill_extractor import extract_skills_fuzzy
-from utils.data_loader import load_skills_database
+from models.skill_extractor import SkillSet, extract_skills_fuzzy, find_keywords, to_skill_set
+from config.settings import PARSED_JOB_CACHE_SIZE
 import re
 
+# ==========================================
+# COMPILED PATTERNS
+# ==========================================
+
+_TITLE_PREFIX_RE = re.compile(r'(position|title|role):\s*', re.IGNORECASE)
+
+_COMPANY_PATTERNS = [re.compile(p) for p in (
+    r'Company:\s*([A-Z][A-Za-z\s&,\.]+)',
+    r'([A-Z][A-Za-z\s&]+(?:Inc|LLC|Corp|Co|Ltd))',
+    r'Join\s+([A-Z][A-Za-z\s&]+)',
+    r'About\s+([A-Z][A-Za-z\s&]+)'
+)]
+
+_LOCATION_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'Location:\s*([A-Za-z\s,]+)',
+    r'([A-Za-z\s]+,\s*[A-Z]{2})',  # City, State
+    r'(Remote|Hybrid|On-site)'
+)]
+
+_SALARY_PATTERNS = [re.compile(p) for p in (
+    r'\$?([\d,]+)k?\s*-\s*\$?([\d,]+)k?',  # $100k - $150k
+    r'([\d,]+)\s*-\s*([\d,]+)',  # 100,000 - 150,000
+)]
+
+# Seniority keywords, highest priority first
+_SENIORITY_KEYWORDS = (
+    ('Senior', ('senior', 'sr.', 'lead', 'principal', 'staff')),
+    ('Junior', ('junior', 'jr.', 'entry', 'associate')),
+    ('Mid-level', ('mid-level', 'intermediate')),
+)
+_SENIORITY_BY_KEYWORD = {
+    keyword: level for level, keywords in _SENIORITY_KEYWORDS for keyword in keywords
+}
+_ALL_SENIORITY_KEYWORDS = tuple(_SENIORITY_BY_KEYWORD)
+
+# Job type keywords in priority order. Keywords that contain another
+# keyword of the same type ('contractor', 'internship', 'temporary') can
+# never decide the result on their own, so they are left out
+_JOB_TYPE_KEYWORDS = (
+    ('Full-time', ('full-time', 'full time', 'fulltime')),
+    ('Part-time', ('part-time', 'part time', 'parttime')),
+    ('Contract', ('contract', 'freelance')),
+    ('Internship', ('intern',)),
+    ('Temporary', ('temp',)),
+)
+
 # ==========================================
 # JOB PARSING
 # ==========================================
 
-def parse_job_description(job_text: str) -> dict:
+@dataclass(frozen=True, slots=True, eq=False)
+class ParsedJob:
+    """
+    Structured information extracted from a job description
+    
+    Instances are cached and shared, so every field is immutable: sequences
+    are tuples and salary_range is a read-only mapping
+    """
+    raw_text: str
+    cleaned_text: str
+    title: str
+    company: str
+    location: str
+    required_skills: tuple
+    required_skill_set: SkillSet  # Lowercased skills, reused by every comparison
+    years_of_experience: int
+    education_required: str
+    salary_range: MappingProxyType
+    job_type: str
+    keywords: tuple
+    word_count: int
+    
+    def __post_init__(self):
+        if not isinstance(self.salary_range, MappingProxyType):
+            object.__setattr__(self, 'salary_range', MappingProxyType(dict(self.salary_range)))
+    
+    def __reduce__(self):
+        # A mappingproxy cannot be pickled (st.cache_data, worker processes)
+        values = [getattr(self, f.name) for f in fields(self)]
+        return (ParsedJob, tuple(dict(v) if isinstance(v, MappingProxyType) else v for v in values))
+
+# Parsed jobs by text, LRU order (jobs parsed in worker processes are added too)
+_parsed_jobs = OrderedDict()
+_parsed_jobs_lock = threading.Lock()
+
+def parse_job_description(job_text: str) -> ParsedJob:
     """
     Parse job description and extract structured information
     
@@ -21,29 +107,50 @@ def parse_job_description(job_text: str) -> dict:
         job_text: Raw job description text
     
     Returns:
-        Dictionary with parsed information
+        ParsedJob (cached per text, treat as read-only)
     """
-    # Load skills database
-    skills_db = load_skills_database()
-    
-    # Extract information
-    parsed = {
-        'raw_text': job_text,
-        'cleaned_text': clean_text(job_text),
-        'title': extract_job_title(job_text),
-        'company': extract_company_name(job_text),
-        'location': extract_location(job_text),
-        'required_skills': extract_skills_fuzzy(job_text, skills_db),
-        'years_of_experience': extract_years_of_experience(job_text),
-        'education_required': extract_years_of_experience(job_text),
-        'salary_range': extract_salary(job_text),
-        'job_type': extract_job_type(job_text),
-        'keywords': extract_keywords(job_text, top_n=20),
-        'word_count': get_word_count(job_text)
-    }
-    
+    parsed = get_cached_job(job_text)
+    if parsed is None:
+        parsed = cache_parsed_job(_parse_job_description(job_text))
     return parsed
 
+def get_cached_job(job_text: str):
+    """Cached ParsedJob for a text (None if it has not been parsed)"""
+    with _parsed_jobs_lock:
+        parsed = _parsed_jobs.get(job_text)
+        if parsed is not None:
+            _parsed_jobs.move_to_end(job_text)
+        return parsed
+
+def cache_parsed_job(parsed: ParsedJob) -> ParsedJob:
+    """Add a parsed job to the cache, evicting the oldest entries"""
+    with _parsed_jobs_lock:
+        _parsed_jobs[parsed.raw_text] = parsed
+        _parsed_jobs.move_to_end(parsed.raw_text)
+        while len(_parsed_jobs) > PARSED_JOB_CACHE_SIZE:
+            _parsed_jobs.popitem(last=False)
+    return parsed
+
+def _parse_job_description(job_text: str) -> ParsedJob:
+    """parse_job_description without the cache"""
+    required_skills = tuple(extract_skills_fuzzy(job_text))
+    
+    return ParsedJob(
+        raw_text=job_text,
+        cleaned_text=clean_text(job_text),
+        title=extract_job_title(job_text),
+        company=extract_company_name(job_text),
+        location=extract_location(job_text),
+        required_skills=required_skills,
+        required_skill_set=to_skill_set(required_skills),
+        years_of_experience=extract_years_of_experience(job_text),
+        education_required=extract_years_of_experience(job_text),
+        salary_range=extract_salary(job_text),
+        job_type=extract_job_type(job_text),
+        keywords=tuple(extract_keywords(job_text, top_n=20)),
+        word_count=get_word_count(job_text)
+    )
+
 # ==========================================
 # JOB TITLE EXTRACTION
 # ==========================================
@@ -62,7 +169,7 @@ def extract_job_title(text: str) -> str:
         
         # Common patterns
         if any(keyword in line.lower() for keyword in ['position:', 'title:', 'role:']):
-            title = re.sub(r'(position|title|role):\s*', '', line, flags=re.IGNORECASE)
+            title = _TITLE_PREFIX_RE.sub('', line)
             return title.strip()
         
         # If line is short and capitalized, likely a title
@@ -79,15 +186,8 @@ def extract_job_title(text: str) -> str:
 def extract_company_name(text: str) -> str:
     """Extract company name from job description"""
     # Look for common patterns
-    patterns = [
-        r'Company:\s*([A-Z][A-Za-z\s&,\.]+)',
-        r'([A-Z][A-Za-z\s&]+(?:Inc|LLC|Corp|Co|Ltd))',
-        r'Join\s+([A-Z][A-Za-z\s&]+)',
-        r'About\s+([A-Z][A-Za-z\s&]+)'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in _COMPANY_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1).strip()
     
@@ -100,14 +200,8 @@ def extract_company_name(text: str) -> str:
 def extract_location(text: str) -> str:
     """Extract job location"""
     # Common location patterns
-    patterns = [
-        r'Location:\s*([A-Za-z\s,]+)',
-        r'([A-Za-z\s]+,\s*[A-Z]{2})',  # City, State
-        r'(Remote|Hybrid|On-site)'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _LOCATION_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1).strip()
     
@@ -130,14 +224,13 @@ def extract_salary(text: str) -> dict:
         'period': 'yearly'
     }
     
-    # Patterns for salary ranges
-    patterns = [
-        r'\$?([\d,]+)k?\s*-\s*\$?([\d,]+)k?',  # $100k - $150k
-        r'([\d,]+)\s*-\s*([\d,]+)',  # 100,000 - 150,000
-    ]
+    # Both range patterns need a dash, skip the scans when there is none
+    if '-' not in text:
+        return salary_info
     
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    # Patterns for salary ranges
+    for pattern in _SALARY_PATTERNS:
+        match = pattern.search(text)
         if match:
             min_sal = match.group(1).replace(',', '')
             max_sal = match.group(2).replace(',', '')
@@ -162,17 +255,9 @@ def extract_job_type(text: str) -> str:
     """
     Extract job type (Full-time, Part-time, Contract, etc.)
     """
-    text_lower = text.lower()
-    
-    job_types = {
-        'Full-time': ['full-time', 'full time', 'fulltime'],
-        'Part-time': ['part-time', 'part time', 'parttime'],
-        'Contract': ['contract', 'contractor', 'freelance'],
-        'Internship': ['intern', 'internship'],
-        'Temporary': ['temporary', 'temp']
-    }
+    text_lower = lower_text(text)
     
-    for job_type, keywords in job_types.items():
+    for job_type, keywords in _JOB_TYPE_KEYWORDS:
         if any(keyword in text_lower for keyword in keywords):
             return job_type
     
@@ -186,25 +271,24 @@ def extract_seniority_level(text: str) -> str:
     """
     Determine seniority level from job description
     """
-    text_lower = text.lower()
+    # One pass over the text for all levels' keywords
+    found = find_keywords(lower_text(text), _ALL_SENIORITY_KEYWORDS)
+    levels = {_SENIORITY_BY_KEYWORD[keyword] for keyword in found}
     
-    if any(word in text_lower for word in ['senior', 'sr.', 'lead', 'principal', 'staff']):
+    for level, _ in _SENIORITY_KEYWORDS:
+        if level in levels:
+            return level
+    
+    # Guess based on years of experience
+    years = extract_years_of_experience(text)
+    if years >= 5:
         return 'Senior'
-    elif any(word in text_lower for word in ['junior', 'jr.', 'entry', 'associate']):
-        return 'Junior'
-    elif any(word in text_lower for word in ['mid-level', 'intermediate']):
+    elif years >= 2:
         return 'Mid-level'
+    elif years > 0:
+        return 'Junior'
     else:
-        # Guess based on years of experience
-        years = extract_years_of_experience(text)
-        if years >= 5:
-            return 'Senior'
-        elif years >= 2:
-            return 'Mid-level'
-        elif years > 0:
-            return 'Junior'
-        else:
-            return 'Entry-level'
+        return 'Entry-level'
 
 # ==========================================
 # TESTING
@@ -238,14 +322,14 @@ if __name__ == "__main__":
     
     parsed = parse_job_description(sample)
     
-    print("Title:", parsed['title'])
-    print("Company:", parsed['company'])
-    print("Location:", parsed['location'])
-    print("Required Skills:", parsed['required_skills'][:5])
-    print("Experience:", parsed['years_of_experience'], "years")
-    print("Education:", parsed['education_required'])
-    print("Salary:", parsed['salary_range'])
-    print("Job Type:", parsed['job_type'])
+    print("Title:", parsed.title)
+    print("Company:", parsed.company)
+    print("Location:", parsed.location)
+    print("Required Skills:", parsed.required_skills[:5])
+    print("Experience:", parsed.years_of_experience, "years")
+    print("Education:", parsed.education_required)
+    print("Salary:", dict(parsed.salary_range))
+    print("Job Type:", parsed.job_type)
     print("Seniority:", extract_seniority_level(sample))
     
     print("\n✅ Job analyzer working!")
\ No newline at end of file
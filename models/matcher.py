@@ -2,21 +2,85 @@
 Matcher - Core matching algorithm between resume and job
 """
 
+import os
 import sys
-sys.path.append('.')
-from sentence_transformers import SentenceTransformer
-from models.resume_parser import parse_resume, compare_education_levels
-from models.job_analyzer import parse_job_description
-from models.skill_extractor import calculate_skill_match, find_missing_skills, find_matching_skills
+import threading
+if '.' not in sys.path:
+    sys.path.append('.')
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from functools import lru_cache
+from multiprocessing import get_context
+from typing import List
+import numpy as np
+from models.resume_parser import ParsedResume, parse_resume, compare_education_levels
+from models.job_analyzer import ParsedJob, parse_job_description, get_cached_job, cache_parsed_job
+from models.skill_extractor import calculate_skill_match, partition_skills, to_skill_set
+from utils.embedding_cache import get_embeddings, get_embedding
 from config.settings import *
-import streamlit as st
 
-# Load Sentence-BERT model
-@st.cache_resource
+# Load Sentence-BERT model (once per process, shared across sessions)
+_MODEL_LOCK = threading.Lock()
+
 def load_sentence_transformer():
-    """Load Sentence-BERT model for semantic similarity"""
+    """
+    Load Sentence-BERT model for semantic similarity
+    
+    Loaded once per process and shared across sessions. The lock keeps the
+    background warm-up and a first request from loading it twice
+    """
+    with _MODEL_LOCK:
+        return _load_sentence_transformer()
+
+@lru_cache(maxsize=1)
+def _load_sentence_transformer():
+    """Build the Sentence-BERT model for the configured backend"""
     print("📥 Loading Sentence-BERT model...")
-    model = SentenceTransformer(SENTENCE_TRANSFORMER_MODEL)
+    
+    # torch is imported here, so importing this module stays cheap
+    import torch
+    from sentence_transformers import SentenceTransformer
+    
+    # Inference is serialized, so each call may use every core
+    torch.set_num_threads(os.cpu_count() or 1)
+    
+    if SENTENCE_TRANSFORMER_BACKEND == "onnx":
+        try:
+            model = SentenceTransformer(
+                SENTENCE_TRANSFORMER_MODEL,
+                backend="onnx",
+                model_kwargs={"file_name": ONNX_MODEL_FILE}
+            )
+            # Quantized vectors differ slightly, keep them in their own cache
+            model.cache_namespace = f"{SENTENCE_TRANSFORMER_MODEL}-onnx-qint8"
+        except Exception as e:
+            print(f"⚠️  ONNX backend unavailable ({e}), using PyTorch")
+            model = SentenceTransformer(SENTENCE_TRANSFORMER_MODEL)
+    elif SENTENCE_TRANSFORMER_BACKEND == "torch-int8":
+        # Dynamic int8 quantization of the Linear layers (CPU only)
+        model = SentenceTransformer(SENTENCE_TRANSFORMER_MODEL, device="cpu")
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        model.cache_namespace = f"{SENTENCE_TRANSFORMER_MODEL}-torch-qint8"
+    elif USE_GPU and torch.cuda.is_available():
+        # Half precision on GPU: bf16 where supported (Ampere+), fp16 otherwise
+        model = SentenceTransformer(SENTENCE_TRANSFORMER_MODEL, device="cuda")
+        if torch.cuda.is_bf16_supported():
+            model = model.to(torch.bfloat16)
+            model.cache_namespace = f"{SENTENCE_TRANSFORMER_MODEL}-cuda-bf16"
+        else:
+            model = model.half()
+            model.cache_namespace = f"{SENTENCE_TRANSFORMER_MODEL}-cuda-fp16"
+    else:
+        model = SentenceTransformer(SENTENCE_TRANSFORMER_MODEL)
+    
+    # Cap input length (attention cost grows quadratically with tokens);
+    # a no-op unless MAX_SEQ_LENGTH is below the model's own limit
+    if MAX_SEQ_LENGTH and model.max_seq_length != MAX_SEQ_LENGTH:
+        namespace = getattr(model, 'cache_namespace', SENTENCE_TRANSFORMER_MODEL)
+        model.max_seq_length = MAX_SEQ_LENGTH
+        model.cache_namespace = f"{namespace}-seq{MAX_SEQ_LENGTH}"
+    
     print("✅ Model loaded!")
     return model
 
@@ -42,29 +106,45 @@ def calculate_match_score(resume_text: str, job_text: str) -> dict:
     # Load model
     model = load_sentence_transformer()
     
+    return _calculate_match_score_parsed(resume, job, model)
+
+def _calculate_match_score_parsed(resume: ParsedResume, job: ParsedJob, model,
+                                  semantic_score: float = None, skills_percentage: float = None,
+                                  experience_score: float = None) -> dict:
+    """
+    calculate_match_score for an already parsed resume and job
+    
+    semantic_score (0-1), skills_percentage (0-100, as returned by
+    calculate_skill_match) and experience_score (0-1) may be passed in
+    when computed for a batch
+    """
     # 1. SEMANTIC SIMILARITY (40%)
-    semantic_score = calculate_semantic_similarity(
-        resume['cleaned_text'], 
-        job['cleaned_text'], 
-        model
-    )
+    if semantic_score is None:
+        semantic_score = calculate_semantic_similarity(
+            resume.cleaned_text, 
+            job.cleaned_text, 
+            model
+        )
     
     # 2. SKILLS MATCH (30%)
-    skills_score = calculate_skill_match(
-        resume['skills'], 
-        job['required_skills']
-    ) / 100  # Normalize to 0-1
+    if skills_percentage is None:
+        skills_percentage = calculate_skill_match(
+            resume.skill_set, 
+            job.required_skill_set
+        )
+    skills_score = skills_percentage / 100  # Normalize to 0-1
     
     # 3. EXPERIENCE MATCH (15%)
-    experience_score = calculate_experience_match(
-        resume['years_of_experience'],
-        job['years_of_experience']
-    )
+    if experience_score is None:
+        experience_score = calculate_experience_match(
+            resume.years_of_experience,
+            job.years_of_experience
+        )
     
     # 4. EDUCATION MATCH (15%)
     education_score = compare_education_levels(
-        resume['education_level'],
-        job['education_required']
+        resume.education_level,
+        job.education_required
     )
     
     # Calculate weighted total
@@ -76,8 +156,7 @@ def calculate_match_score(resume_text: str, job_text: str) -> dict:
     ) * 100  # Convert to 0-100 scale
     
     # Find skill gaps
-    missing_skills = find_missing_skills(resume['skills'], job['required_skills'])
-    matching_skills = find_matching_skills(resume['skills'], job['required_skills'])
+    matching_skills, missing_skills = partition_skills(resume.skill_set, job.required_skills)
     
     # Compile results
     results = {
@@ -96,7 +175,7 @@ def calculate_match_score(resume_text: str, job_text: str) -> dict:
         'job': job,
         'matching_skills': matching_skills,
         'missing_skills': missing_skills,
-        'skills_match_count': f"{len(matching_skills)}/{len(job['required_skills'])}"
+        'skills_match_count': f"{len(matching_skills)}/{len(job.required_skills)}"
     }
     
     return results
@@ -117,15 +196,11 @@ def calculate_semantic_similarity(text1: str, text2: str, model) -> float:
     Returns:
         Similarity score (0-1)
     """
-    # Generate embeddings
-    embedding1 = model.encode(text1, convert_to_tensor=True)
-    embedding2 = model.encode(text2, convert_to_tensor=True)
+    # Generate both embeddings (cached on disk, misses encoded in one batch)
+    embeddings = get_embeddings([text1, text2], model)
     
-    # Calculate cosine similarity
-    from torch.nn.functional import cosine_similarity
-    similarity = cosine_similarity(embedding1.unsqueeze(0), embedding2.unsqueeze(0))
-    
-    return similarity.item()
+    # Cosine similarity of normalized vectors is their dot product
+    return float(embeddings[0] @ embeddings[1])
 
 def calculate_experience_match(resume_years: int, required_years: int) -> float:
     """
@@ -152,6 +227,192 @@ def calculate_experience_match(resume_years: int, required_years: int) -> float:
     else:
         return 0.0  # No experience
 
+# Experience scores by number of thresholds met (> 0, >= 60%, >= 80%, >= 100%)
+_EXPERIENCE_SCORES = np.array([0.0, 0.4, 0.7, 0.9, 1.0])
+
+def calculate_experience_matches(resume_years: int, required_years: np.ndarray) -> np.ndarray:
+    """
+    calculate_experience_match of one resume against many requirements
+    
+    Args:
+        resume_years: Years of experience in resume
+        required_years: Required years per job
+    
+    Returns:
+        Array of scores (0-1)
+    """
+    required_years = np.asarray(required_years, dtype=np.float64)
+    
+    # Thresholds are nested, so the number met indexes the score table
+    level = (
+        int(resume_years > 0)
+        + (resume_years >= required_years * 0.6)
+        + (resume_years >= required_years * 0.8)
+        + (resume_years >= required_years)
+    )
+    scores = _EXPERIENCE_SCORES[level]
+    
+    return np.where(required_years == 0, 1.0, scores)
+
+# ==========================================
+# JOB CORPUS
+# ==========================================
+
+# Set bits in each byte value (for numpy without bitwise_count)
+_POPCOUNT8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    """Number of set bits in each uint8 element"""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(bits)
+    return _POPCOUNT8[bits]
+
+@dataclass
+class JobCorpus:
+    """Parsed jobs stored column-wise, with all embeddings in one matrix"""
+    indices: List[int]        # Position of each job in the input list
+    jobs: List[ParsedJob]     # Parsed job descriptions
+    embeddings: np.ndarray    # (K, d) float32, L2-normalized rows
+    required_years: np.ndarray  # (K,) required years of experience
+    skill_vocab: dict         # Lowercased skill -> bit of skill_bits
+    skill_bits: np.ndarray    # (K, ceil(V/8)) uint8, required skills per job as bitmasks
+    required_counts: np.ndarray  # (K,) number of required skills per job
+    
+    def skill_percentages(self, resume_skills) -> List[float]:
+        """calculate_skill_match of the resume against every job at once"""
+        resume_mask = np.zeros(len(self.skill_vocab), dtype=bool)
+        for skill in to_skill_set(resume_skills):
+            column = self.skill_vocab.get(skill)
+            if column is not None:
+                resume_mask[column] = True
+        
+        # Matched skills per job: AND against the resume bitmask, then popcount
+        matched = _popcount(self.skill_bits & np.packbits(resume_mask)).sum(axis=1, dtype=np.int64)
+        required = self.required_counts
+        
+        return [
+            round(float(m / r * 100), 2) if r else 100.0
+            for m, r in zip(matched.tolist(), required.tolist())
+        ]
+
+def _parse_job_safe(i: int, job_text: str):
+    """Parse one job description (None if it fails)"""
+    try:
+        return parse_job_description(job_text)
+    except Exception as e:
+        print(f"⚠️  Error matching job {i}: {e}")
+        return None
+
+# Job parsing worker processes, started on first use and kept for later batches
+_PARSE_POOL = None
+_PARSE_POOL_LOCK = threading.Lock()
+
+def _init_parse_worker():
+    """Load the skills database and automaton once per worker process"""
+    from models.skill_extractor import load_skill_automaton
+    load_skill_automaton()
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Process pool for job parsing, shared by every batch and session
+    
+    Workers are spawned rather than forked: this process runs torch and the
+    warm-up thread, and forking a multi-threaded process can deadlock
+    """
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is None:
+            _PARSE_POOL = ProcessPoolExecutor(
+                max_workers=NUM_WORKERS,
+                mp_context=get_context("spawn"),
+                initializer=_init_parse_worker
+            )
+        return _PARSE_POOL
+
+def _discard_parse_pool(pool: ProcessPoolExecutor):
+    """Drop a broken pool so the next large batch starts a new one"""
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is pool:
+            _PARSE_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _parse_jobs(job_list: list) -> list:
+    """
+    Parse job descriptions in parallel
+    
+    Jobs already in the parse cache are reused. Regex and skill extraction
+    hold the GIL, so large batches of new jobs are parsed in worker processes
+    and added to this process's cache; small ones (or a pool that cannot
+    start) use threads
+    """
+    parsed = [get_cached_job(job_text) for job_text in job_list]
+    pending = [i for i, job in enumerate(parsed) if job is None]
+    
+    if BATCH_PROCESSING and len(pending) >= PROCESS_POOL_MIN_JOBS:
+        pool = None
+        try:
+            pool = _get_parse_pool()
+            chunksize = max(1, len(pending) // (NUM_WORKERS * 4))
+            results = pool.map(_parse_job_safe, pending, [job_list[i] for i in pending], chunksize=chunksize)
+            for i, job in zip(pending, results):
+                parsed[i] = cache_parsed_job(job) if job is not None else None
+            return parsed
+        except (BrokenProcessPool, OSError) as e:
+            print(f"⚠️  Process pool unavailable, parsing on threads: {e}")
+            if pool is not None:
+                _discard_parse_pool(pool)
+    
+    with ThreadPoolExecutor(max_workers=NUM_WORKERS) as executor:
+        results = executor.map(_parse_job_safe, pending, [job_list[i] for i in pending])
+        for i, job in zip(pending, results):
+            parsed[i] = job
+    
+    return parsed
+
+def build_job_corpus(job_list: list, model) -> JobCorpus:
+    """
+    Parse and embed a list of job descriptions
+    
+    Args:
+        job_list: List of job description texts
+        model: Sentence-BERT model
+    
+    Returns:
+        JobCorpus of the jobs that parsed successfully
+    """
+    parsed = _parse_jobs(job_list)
+    
+    indices = [i for i, job in enumerate(parsed) if job is not None]
+    jobs = [parsed[i] for i in indices]
+    
+    # All job embeddings in one batched encode
+    if jobs:
+        embeddings = get_embeddings([job.cleaned_text for job in jobs], model)
+    else:
+        embeddings = np.empty((0, 0), dtype=np.float32)
+    
+    # Required skills as a job x skill matrix, stored packed 8 skills per byte
+    skill_vocab = {}
+    for job in jobs:
+        for skill in job.required_skill_set:
+            skill_vocab.setdefault(skill, len(skill_vocab))
+    
+    skill_matrix = np.zeros((len(jobs), len(skill_vocab)), dtype=bool)
+    for row, job in enumerate(jobs):
+        for skill in job.required_skill_set:
+            skill_matrix[row, skill_vocab[skill]] = True
+    
+    return JobCorpus(
+        indices=indices,
+        jobs=jobs,
+        embeddings=embeddings,
+        required_years=np.array([job.years_of_experience for job in jobs], dtype=np.int64),
+        skill_vocab=skill_vocab,
+        skill_bits=np.packbits(skill_matrix, axis=1),
+        required_counts=skill_matrix.sum(axis=1)
+    )
+
 # ==========================================
 # BATCH MATCHING
 # ==========================================
@@ -167,11 +428,35 @@ def match_resume_to_multiple_jobs(resume_text: str, job_list: list) -> list:
     Returns:
         List of match results sorted by score
     """
-    results = []
+    # The resume is the same for every job, parse it once
+    resume = parse_resume(resume_text)
+    model = load_sentence_transformer()
+    
+    corpus = build_job_corpus(job_list, model)
+    if not corpus.jobs:
+        return []
     
-    for i, job_text in enumerate(job_list):
+    # Normalized embeddings: all similarities in one matrix-vector product
+    resume_embedding = get_embedding(resume.cleaned_text, model)
+    similarities = corpus.embeddings @ resume_embedding
+    
+    # Skill and experience match for every job at once
+    skill_percentages = corpus.skill_percentages(resume.skill_set)
+    experience_scores = calculate_experience_matches(
+        resume.years_of_experience, corpus.required_years
+    )
+    
+    results = []
+    for i, job, similarity, skills_percentage, experience_score in zip(
+        corpus.indices, corpus.jobs, similarities, skill_percentages, experience_scores.tolist()
+    ):
         try:
-            match = calculate_match_score(resume_text, job_text)
+            match = _calculate_match_score_parsed(
+                resume, job, model,
+                semantic_score=float(similarity),
+                skills_percentage=skills_percentage,
+                experience_score=experience_score
+            )
             match['job_index'] = i
             results.append(match)
         except Exception as e:
@@ -232,8 +517,8 @@ def generate_match_insights(match_result: dict) -> list:
     if experience >= 90:
         insights.append("✅ Your experience level matches perfectly.")
     elif experience < 70:
-        resume_years = match_result['resume']['years_of_experience']
-        job_years = match_result['job']['years_of_experience']
+        resume_years = match_result['resume'].years_of_experience
+        job_years = match_result['job'].years_of_experience
         if resume_years < job_years:
             insights.append(f"⚠️  Job requires {job_years}+ years, you have {resume_years} years.")
     
@@ -241,7 +526,7 @@ def generate_match_insights(match_result: dict) -> list:
     if education >= 90:
         insights.append("✅ Your education meets the requirements.")
     elif education < 70:
-        insights.append(f"⚠️  Job requires: {match_result['job']['education_required']}")
+        insights.append(f"⚠️  Job requires: {match_result['job'].education_required}")
     
     return insights
 
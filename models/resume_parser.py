@@ -3,17 +3,91 @@ Resume Parser - Extract structured info from resumes
 """
 
 import sys
-sys.path.append('.')
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from types import MappingProxyType
+if '.' not in sys.path:
+    sys.path.append('.')
 from utils.text_processor import *
-from models.skill_extractor import extract_skills_fuzzy
-from utils.data_loader import load_skills_database
+from models.skill_extractor import SkillSet, extract_skills_fuzzy, find_keywords, to_skill_set
 import re
 
+# ==========================================
+# COMPILED PATTERNS
+# ==========================================
+
+_COMPANY_EXTRACT_PATTERNS = [re.compile(p) for p in (
+    r'(?:at|@)\s+([A-Z][A-Za-z\s&,\.]+(?:Inc|LLC|Corp|Co|Ltd)?)',
+    r'([A-Z][A-Za-z\s&]+(?:Inc|LLC|Corp|Co|Ltd))'
+)]
+
+_COMMON_TITLES = (
+    'engineer', 'developer', 'scientist', 'analyst', 'manager',
+    'architect', 'consultant', 'designer', 'specialist', 'lead',
+    'director', 'coordinator', 'administrator', 'technician'
+)
+
+# Context window around each title keyword
+_JOB_TITLE_PATTERNS = {
+    title: re.compile(r'([A-Za-z\s]{0,20}' + title + r'[A-Za-z\s]{0,20})', re.IGNORECASE)
+    for title in _COMMON_TITLES
+}
+
+# Education level keywords, highest level first
+_EDUCATION_LEVEL_PATTERNS = (
+    ('PhD', ('ph.d', 'phd', 'doctorate', 'doctoral')),
+    ('Masters', ('master', 'msc', 'm.sc', 'ma', 'm.a', 'mba', 'ms', 'm.s')),
+    ('Bachelors', ('bachelor', 'bsc', 'b.sc', 'ba', 'b.a', 'bs', 'b.s', 'be', 'b.e', 'btech', 'b.tech')),
+    ('Associates', ('associate', 'as', 'a.s', 'aa', 'a.a')),
+    ('High School', ('high school', 'secondary school', 'diploma')),
+)
+
+# Education levels, lowest to highest
+EDUCATION_HIERARCHY = {
+    'High School': 1,
+    'Associates': 2,
+    'Bachelors': 3,
+    'Masters': 4,
+    'PhD': 5,
+    'Unknown': 0
+}
+
 # ==========================================
 # RESUME PARSING
 # ==========================================
 
-def parse_resume(resume_text: str) -> dict:
+@dataclass(frozen=True, slots=True, eq=False)
+class ParsedResume:
+    """
+    Structured information extracted from a resume
+    
+    Instances are cached and shared, so every field is immutable: sequences
+    are tuples and sections is a read-only mapping
+    """
+    raw_text: str
+    cleaned_text: str
+    email: str
+    phone: str
+    urls: tuple
+    skills: tuple
+    skill_set: SkillSet  # Lowercased skills, reused by every comparison
+    years_of_experience: int
+    sections: MappingProxyType
+    keywords: tuple
+    word_count: int
+    education_level: str
+    
+    def __post_init__(self):
+        if not isinstance(self.sections, MappingProxyType):
+            object.__setattr__(self, 'sections', MappingProxyType(dict(self.sections)))
+    
+    def __reduce__(self):
+        # A mappingproxy cannot be pickled (st.cache_data, worker processes)
+        values = [getattr(self, f.name) for f in fields(self)]
+        return (ParsedResume, tuple(dict(v) if isinstance(v, MappingProxyType) else v for v in values))
+
+@lru_cache(maxsize=256)
+def parse_resume(resume_text: str) -> ParsedResume:
     """
     Parse resume and extract structured information
     
@@ -21,27 +95,24 @@ def parse_resume(resume_text: str) -> dict:
         resume_text: Raw resume text
     
     Returns:
-        Dictionary with parsed information
+        ParsedResume (cached per text, treat as read-only)
     """
-    # Load skills database
-    skills_db = load_skills_database()
-    
-    # Extract information
-    parsed = {
-        'raw_text': resume_text,
-        'cleaned_text': clean_text(resume_text),
-        'email': extract_email(resume_text),
-        'phone': extract_phone(resume_text),
-        'urls': extract_urls(resume_text),
-        'skills': extract_skills_fuzzy(resume_text, skills_db),
-        'years_of_experience': extract_years_of_experience(resume_text),
-        'sections': detect_sections(resume_text),
-        'keywords': extract_keywords(resume_text, top_n=20),
-        'word_count': get_word_count(resume_text),
-        'education_level': extract_education_level(resume_text)
-    }
-    
-    return parsed
+    skills = tuple(extract_skills_fuzzy(resume_text))
+    
+    return ParsedResume(
+        raw_text=resume_text,
+        cleaned_text=clean_text(resume_text),
+        email=extract_email(resume_text),
+        phone=extract_phone(resume_text),
+        urls=tuple(extract_urls(resume_text)),
+        skills=skills,
+        skill_set=to_skill_set(skills),
+        years_of_experience=extract_years_of_experience(resume_text),
+        sections=detect_sections(resume_text),
+        keywords=tuple(extract_keywords(resume_text, top_n=20)),
+        word_count=get_word_count(resume_text),
+        education_level=extract_education_level(resume_text)
+    )
 
 # ==========================================
 # EDUCATION EXTRACTION
@@ -53,32 +124,12 @@ def extract_education_level(text: str) -> str:
     
     Returns: 'PhD', 'Masters', 'Bachelors', 'Associates', 'High School', or 'Unknown'
     """
-    text_lower = text.lower()
-    
-    # PhD patterns
-    phd_patterns = ['ph.d', 'phd', 'doctorate', 'doctoral']
-    if any(pattern in text_lower for pattern in phd_patterns):
-        return 'PhD'
-    
-    # Masters patterns
-    masters_patterns = ['master', 'msc', 'm.sc', 'ma', 'm.a', 'mba', 'ms', 'm.s']
-    if any(pattern in text_lower for pattern in masters_patterns):
-        return 'Masters'
-    
-    # Bachelors patterns
-    bachelors_patterns = ['bachelor', 'bsc', 'b.sc', 'ba', 'b.a', 'bs', 'b.s', 'be', 'b.e', 'btech', 'b.tech']
-    if any(pattern in text_lower for pattern in bachelors_patterns):
-        return 'Bachelors'
-    
-    # Associates patterns
-    associates_patterns = ['associate', 'as', 'a.s', 'aa', 'a.a']
-    if any(pattern in text_lower for pattern in associates_patterns):
-        return 'Associates'
+    text_lower = lower_text(text)
     
-    # High school
-    hs_patterns = ['high school', 'secondary school', 'diploma']
-    if any(pattern in text_lower for pattern in hs_patterns):
-        return 'High School'
+    # Highest level first; stops at the first level with any pattern present
+    for level, patterns in _EDUCATION_LEVEL_PATTERNS:
+        if any(pattern in text_lower for pattern in patterns):
+            return level
     
     return 'Unknown'
 
@@ -88,17 +139,8 @@ def compare_education_levels(resume_edu: str, required_edu: str) -> float:
     
     Returns: Score 0-1 (1 = meets or exceeds requirement)
     """
-    education_hierarchy = {
-        'High School': 1,
-        'Associates': 2,
-        'Bachelors': 3,
-        'Masters': 4,
-        'PhD': 5,
-        'Unknown': 0
-    }
-    
-    resume_level = education_hierarchy.get(resume_edu, 0)
-    required_level = education_hierarchy.get(required_edu, 0)
+    resume_level = EDUCATION_HIERARCHY.get(resume_edu, 0)
+    required_level = EDUCATION_HIERARCHY.get(required_edu, 0)
     
     if required_level == 0:  # No requirement
         return 1.0
@@ -121,13 +163,8 @@ def extract_company_names(text: str) -> list:
     # Look for lines with capitalized words after "at" or before job titles
     companies = []
     
-    patterns = [
-        r'(?:at|@)\s+([A-Z][A-Za-z\s&,\.]+(?:Inc|LLC|Corp|Co|Ltd)?)',
-        r'([A-Z][A-Za-z\s&]+(?:Inc|LLC|Corp|Co|Ltd))'
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
+    for pattern in _COMPANY_EXTRACT_PATTERNS:
+        matches = pattern.findall(text)
         companies.extend(matches)
     
     # Clean and deduplicate
@@ -136,20 +173,15 @@ def extract_company_names(text: str) -> list:
 
 def extract_job_titles(text: str) -> list:
     """Extract potential job titles"""
-    common_titles = [
-        'engineer', 'developer', 'scientist', 'analyst', 'manager',
-        'architect', 'consultant', 'designer', 'specialist', 'lead',
-        'director', 'coordinator', 'administrator', 'technician'
-    ]
-    
     titles = []
-    text_lower = text.lower()
     
-    for title in common_titles:
-        if title in text_lower:
+    # All title keywords present in the text, found in one pass
+    present = find_keywords(lower_text(text), _COMMON_TITLES)
+    
+    for title, pattern in _JOB_TITLE_PATTERNS.items():
+        if title in present:
             # Find context around the title
-            pattern = r'([A-Za-z\s]{0,20}' + title + r'[A-Za-z\s]{0,20})'
-            matches = re.findall(pattern, text, re.IGNORECASE)
+            matches = pattern.findall(text)
             titles.extend([m.strip() for m in matches if len(m.strip()) > 5])
     
     return list(set(titles))[:5]  # Top 5
@@ -158,7 +190,7 @@ def extract_job_titles(text: str) -> list:
 # RESUME QUALITY METRICS
 # ==========================================
 
-def assess_resume_quality(parsed_resume: dict) -> dict:
+def assess_resume_quality(parsed_resume: ParsedResume) -> dict:
     """
     Assess resume quality based on completeness
     
@@ -175,35 +207,35 @@ def assess_resume_quality(parsed_resume: dict) -> dict:
     }
     
     # Check contact info
-    if parsed_resume.get('email') or parsed_resume.get('phone'):
+    if parsed_resume.email or parsed_resume.phone:
         quality['has_contact'] = True
         quality['completeness_score'] += 20
     else:
         quality['issues'].append("Missing contact information")
     
     # Check skills
-    if len(parsed_resume.get('skills', [])) >= 3:
+    if len(parsed_resume.skills) >= 3:
         quality['has_skills'] = True
         quality['completeness_score'] += 30
     else:
         quality['issues'].append("Few or no skills listed")
     
     # Check experience section
-    if parsed_resume['sections'].get('experience'):
+    if parsed_resume.sections.get('experience'):
         quality['has_experience'] = True
         quality['completeness_score'] += 30
     else:
         quality['issues'].append("Missing experience section")
     
     # Check education section
-    if parsed_resume['sections'].get('education'):
+    if parsed_resume.sections.get('education'):
         quality['has_education'] = True
         quality['completeness_score'] += 10
     else:
         quality['issues'].append("Missing education section")
     
     # Check word count
-    word_count = parsed_resume['word_count']
+    word_count = parsed_resume.word_count
     if 200 <= word_count <= 1000:
         quality['word_count_ok'] = True
         quality['completeness_score'] += 10
@@ -242,11 +274,11 @@ if __name__ == "__main__":
     
     parsed = parse_resume(sample)
     
-    print("Contact:", parsed['email'], parsed['phone'])
-    print("Skills:", parsed['skills'][:5])
-    print("Experience:", parsed['years_of_experience'], "years")
-    print("Education:", parsed['education_level'])
-    print("Sections:", parsed['sections'])
+    print("Contact:", parsed.email, parsed.phone)
+    print("Skills:", parsed.skills[:5])
+    print("Experience:", parsed.years_of_experience, "years")
+    print("Education:", parsed.education_level)
+    print("Sections:", dict(parsed.sections))
     
     quality = assess_resume_quality(parsed)
     print(f"\nQuality Score: {quality['completeness_score']}/100")
@@ -2,18 +2,153 @@
 Skill Extractor - Extract skills from resume/job text
 """
 
-import spacy
 from typing import List, Set
+from functools import lru_cache
 import sys
-sys.path.append('.')
-from utils.data_loader import load_skills_database
+if '.' not in sys.path:
+    sys.path.append('.')
+from utils.skills_loader import load_skills_database, get_skills_database_mtime
+from config.settings import SPACY_MODEL, SPACY_BATCH_SIZE
 
-# Load spaCy model
+# Optional: Aho-Corasick automaton for single-pass skill matching
 try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    print("⚠️  spaCy model not found. Run: python -m spacy download en_core_web_sm")
-    nlp = None
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Only NER is used; the other components would run on every document
+_SPACY_UNUSED_PIPES = ("parser", "tagger", "lemmatizer", "attribute_ruler")
+
+# Entity labels kept as skills
+_SPACY_SKILL_LABELS = frozenset({"ORG", "PRODUCT", "GPE"})
+
+# Load spaCy model (lazily, once per process)
+@lru_cache(maxsize=1)
+def load_spacy_model():
+    """Load spaCy model for NER"""
+    try:
+        import spacy
+        return spacy.load(SPACY_MODEL, disable=_SPACY_UNUSED_PIPES)
+    except Exception:
+        print("⚠️  spaCy model not found. Run: python -m spacy download en_core_web_sm")
+        return None
+
+# ==========================================
+# SKILL AUTOMATON
+# ==========================================
+
+def _skill_variants(skill: str) -> tuple:
+    """Lowercase forms of a skill accepted by fuzzy matching"""
+    skill_lower = skill.lower()
+    return (
+        skill_lower,
+        skill_lower.replace('.', ''),  # Remove dots (e.g., "Node.js" → "Nodejs")
+        skill_lower.replace('-', ' '),  # Replace hyphens
+        skill_lower.replace(' ', ''),   # Remove spaces
+    )
+
+@lru_cache(maxsize=8)
+def _skill_variant_table(skills: tuple) -> tuple:
+    """
+    (skill, lowercase padded form, fuzzy variants) for every skill
+    
+    Built once per skill list so the fallback loops do no per-call
+    lowercasing or string replacement
+    """
+    return tuple(
+        (skill, f" {skill.lower()} ", tuple(dict.fromkeys(_skill_variants(skill))))
+        for skill in skills
+    )
+
+@lru_cache(maxsize=8)
+def _build_skill_automaton(skills: tuple, whole_word: bool = False):
+    """
+    Build an Aho-Corasick automaton over all skill variants
+    
+    Each variant maps to the tuple of skills it belongs to, so one scan
+    of the text finds every skill the per-skill substring loop would.
+    With whole_word, the only key is the space-padded lowercase skill,
+    to be scanned against space-padded text.
+    """
+    automaton = ahocorasick.Automaton()
+    
+    for skill in skills:
+        if whole_word:
+            variants = (f" {skill.lower()} ",)
+        else:
+            variants = set(_skill_variants(skill))
+        
+        for variant in variants:
+            if variant:
+                owners = automaton.get(variant, ())
+                automaton.add_word(variant, owners + (skill,))
+    
+    automaton.make_automaton()
+    return automaton
+
+def load_skill_automaton(whole_word: bool = False):
+    """
+    Automaton over the default skills database
+    
+    Built once per process and rebuilt when the skills file changes.
+    Returns None when the database is missing or empty
+    """
+    return _load_skill_automaton(get_skills_database_mtime(), whole_word)
+
+@lru_cache(maxsize=2)
+def _load_skill_automaton(mtime: float, whole_word: bool):
+    """load_skill_automaton, keyed by the skills file's modification time"""
+    skills_db = load_skills_database()
+    if not skills_db:
+        return None
+    return _build_skill_automaton(skills_db, whole_word)
+
+def _scan_skills(text_lower: str, skills_db, whole_word: bool = False):
+    """
+    Set of skills found by one automaton pass over the text
+    
+    Returns None when pyahocorasick is not installed
+    """
+    if ahocorasick is None:
+        return None
+    
+    if skills_db is None:
+        # Default database: no per-call copy or hashing of the skill list
+        automaton = load_skill_automaton(whole_word)
+    elif skills_db:
+        automaton = _build_skill_automaton(tuple(skills_db), whole_word)
+    else:
+        automaton = None
+    
+    found_skills = set()
+    if automaton is not None:
+        for _, skills in automaton.iter(text_lower):
+            found_skills.update(skills)
+    return found_skills
+
+@lru_cache(maxsize=32)
+def _build_keyword_automaton(keywords: tuple):
+    """Build an Aho-Corasick automaton over a fixed set of keywords"""
+    automaton = ahocorasick.Automaton()
+    
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    
+    automaton.make_automaton()
+    return automaton
+
+def find_keywords(text_lower: str, keywords: tuple) -> Set[str]:
+    """
+    Find which keywords occur as substrings of (lowercased) text
+    
+    Uses one Aho-Corasick pass when pyahocorasick is installed, otherwise
+    one substring test per keyword
+    """
+    if ahocorasick is not None and keywords:
+        automaton = _build_keyword_automaton(keywords)
+        return {keyword for _, keyword in automaton.iter(text_lower)}
+    
+    return {keyword for keyword in keywords if keyword in text_lower}
 
 # ==========================================
 # SKILL EXTRACTION
@@ -30,15 +165,22 @@ def extract_skills(text: str, skills_db: List[str] = None) -> List[str]:
     Returns:
         List of found skills
     """
+    text_lower = text.lower()
+    
+    # Single pass over the padded text with the automaton (if installed)
+    found = _scan_skills(f" {text_lower} ", skills_db, whole_word=True)
+    if found is not None:
+        return list(found)
+    
     if skills_db is None:
         skills_db = load_skills_database()
     
-    text_lower = text.lower()
+    padded_text = f" {text_lower} "
     found_skills = []
     
-    for skill in skills_db:
+    for skill, padded_skill, _ in _skill_variant_table(tuple(skills_db)):
         # Match whole words
-        if f" {skill.lower()} " in f" {text_lower} ":
+        if padded_skill in padded_text:
             found_skills.append(skill)
     
     return list(set(found_skills))
@@ -54,32 +196,22 @@ def extract_skills_fuzzy(text: str, skills_db: List[str] = None) -> List[str]:
     Returns:
         List of found skills
     """
+    text_lower = text.lower()
+    
+    # Single pass over the text with the automaton (if installed)
+    found_skills = _scan_skills(text_lower, skills_db)
+    if found_skills is not None:
+        return list(found_skills)
+    
     if skills_db is None:
         skills_db = load_skills_database()
     
-    text_lower = text.lower()
-    found_skills = set()
-    
-    # Direct matching
-    for skill in skills_db:
-        skill_lower = skill.lower()
-        
-        # Exact match
-        if skill_lower in text_lower:
-            found_skills.add(skill)
-            continue
-        
-        # Handle common variations
-        variations = [
-            skill_lower.replace('.', ''),  # Remove dots (e.g., "Node.js" → "Nodejs")
-            skill_lower.replace('-', ' '),  # Replace hyphens
-            skill_lower.replace(' ', ''),   # Remove spaces
-        ]
-        
-        for var in variations:
-            if var in text_lower:
-                found_skills.add(skill)
-                break
+    # Exact match or any common variation (precomputed per skill list)
+    found_skills = {
+        skill
+        for skill, _, variants in _skill_variant_table(tuple(skills_db))
+        if any(var in text_lower for var in variants)
+    }
     
     return list(found_skills)
 
@@ -93,29 +225,68 @@ def extract_skills_with_spacy(text: str) -> List[str]:
     Returns:
         List of extracted entities
     """
+    return list(_spacy_entities(text))
+
+@lru_cache(maxsize=512)
+def _spacy_entities(text: str) -> tuple:
+    """Skill-like entities of one text (cached per text)"""
+    nlp = load_spacy_model()
     if nlp is None:
-        return []
+        return ()
+    
+    return _doc_entities(nlp(text))
+
+def _doc_entities(doc) -> tuple:
+    """Unique ORG/PRODUCT/GPE entity texts of a spaCy doc"""
+    return tuple({ent.text for ent in doc.ents if ent.label_ in _SPACY_SKILL_LABELS})
+
+def extract_skills_with_spacy_batch(texts: List[str], batch_size: int = SPACY_BATCH_SIZE,
+                                    n_process: int = 1) -> List[List[str]]:
+    """
+    Extract skills from many texts using spaCy NER
     
-    doc = nlp(text)
-    skills = []
+    Args:
+        texts: Resume or job description texts
+        batch_size: Documents per nlp.pipe batch
+        n_process: Worker processes for nlp.pipe
     
-    for ent in doc.ents:
-        if ent.label_ in ["ORG", "PRODUCT", "GPE"]:
-            skills.append(ent.text)
+    Returns:
+        List of extracted entities for each text
+    """
+    nlp = load_spacy_model()
+    if nlp is None:
+        return [[] for _ in texts]
     
-    return list(set(skills))
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+    return [list(_doc_entities(doc)) for doc in docs]
 
 # ==========================================
 # SKILL COMPARISON
 # ==========================================
 
+class SkillSet(frozenset):
+    """Frozenset of lowercased skills (only built by to_skill_set)"""
+    __slots__ = ()
+
+def to_skill_set(skills) -> SkillSet:
+    """
+    Lowercased skill set used for comparisons
+    
+    A SkillSet is already lowercased and returned as is, so callers can
+    build it once and reuse it across many comparisons. Anything else,
+    including a plain frozenset, is lowercased
+    """
+    if isinstance(skills, SkillSet):
+        return skills
+    return SkillSet(s.lower() for s in skills)
+
 def calculate_skill_match(resume_skills: List[str], job_skills: List[str]) -> float:
     """
     Calculate skill match percentage
     
     Args:
-        resume_skills: Skills from resume
-        job_skills: Required skills from job
+        resume_skills: Skills from resume (list, or SkillSet from to_skill_set)
+        job_skills: Required skills from job (list, or SkillSet from to_skill_set)
     
     Returns:
         Match percentage (0-100)
@@ -123,8 +294,8 @@ def calculate_skill_match(resume_skills: List[str], job_skills: List[str]) -> fl
     if not job_skills:
         return 100.0
     
-    resume_set = set(s.lower() for s in resume_skills)
-    job_set = set(s.lower() for s in job_skills)
+    resume_set = to_skill_set(resume_skills)
+    job_set = to_skill_set(job_skills)
     
     matched = resume_set & job_set
     match_percentage = (len(matched) / len(job_set)) * 100
@@ -136,37 +307,50 @@ def find_missing_skills(resume_skills: List[str], job_skills: List[str]) -> List
     Find skills present in job but missing from resume
     
     Args:
-        resume_skills: Skills from resume
+        resume_skills: Skills from resume (list, or SkillSet from to_skill_set)
         job_skills: Required skills from job
     
     Returns:
         List of missing skills
     """
-    resume_set = set(s.lower() for s in resume_skills)
-    job_set = set(s.lower() for s in job_skills)
-    
-    missing = job_set - resume_set
+    resume_set = to_skill_set(resume_skills)
     
     # Return with original casing from job_skills
-    return [s for s in job_skills if s.lower() in missing]
+    return [s for s in job_skills if s.lower() not in resume_set]
 
 def find_matching_skills(resume_skills: List[str], job_skills: List[str]) -> List[str]:
     """
     Find skills present in both resume and job
     
     Args:
-        resume_skills: Skills from resume
+        resume_skills: Skills from resume (list, or SkillSet from to_skill_set)
         job_skills: Required skills from job
     
     Returns:
         List of matching skills
     """
-    resume_set = set(s.lower() for s in resume_skills)
-    job_set = set(s.lower() for s in job_skills)
+    resume_set = to_skill_set(resume_skills)
     
-    matched = resume_set & job_set
+    return [s for s in job_skills if s.lower() in resume_set]
+
+def partition_skills(resume_skills: List[str], job_skills: List[str]) -> tuple:
+    """
+    find_matching_skills and find_missing_skills in a single pass
+    
+    Args:
+        resume_skills: Skills from resume (list, or SkillSet from to_skill_set)
+        job_skills: Required skills from job
     
-    return [s for s in job_skills if s.lower() in matched]
+    Returns:
+        (matching skills, missing skills), with original casing from job_skills
+    """
+    resume_set = to_skill_set(resume_skills)
+    matching, missing = [], []
+    
+    for skill in job_skills:
+        (matching if skill.lower() in resume_set else missing).append(skill)
+    
+    return matching, missing
 
 # ==========================================
 # TESTING
@@ -202,12 +386,9 @@ if __name__ == "__main__":
     match_pct = calculate_skill_match(resume_skills, job_skills)
     print(f"Match: {match_pct}%")
     
-    # Find missing
-    missing = find_missing_skills(resume_skills, job_skills)
+    # Find matching and missing
+    matching, missing = partition_skills(resume_skills, job_skills)
     print(f"Missing: {missing}")
-    
-    # Find matching
-    matching = find_matching_skills(resume_skills, job_skills)
     print(f"Matching: {matching}")
     
     print("\n✅ Skill extractor working!")
\ No newline at end of file
@@ -3,18 +3,60 @@ LinkedIn Dataset Processor
 Loads, cleans, and merges multiple CSV files into a unified dataset
 """
 
+import numpy as np
 import pandas as pd
 import os
 from pathlib import Path
 
+# Optional: PyArrow's multithreaded CSV parser and Parquet output
+try:
+    import pyarrow
+    CSV_ENGINE = 'pyarrow'
+    OUTPUT_FORMAT = 'parquet'
+except ImportError:
+    CSV_ENGINE = None
+    OUTPUT_FORMAT = 'csv'
+
 # Paths
 BASE_DIR = Path(r"D:\job-matcher-system")
 DATA_DIR = BASE_DIR / "data" / "linkedin_jobs"
 OUTPUT_DIR = BASE_DIR / "data" / "processed"
 
-def load_linkedin_data():
+# Postings rows merged and cleaned at a time
+POSTINGS_CHUNK_SIZE = 100_000
+
+# Columns that identify a posting, in order of preference
+ID_COLUMNS = ('job_id', 'posting_id', 'id')
+
+def find_id_column(df):
+    """Column that identifies a posting (None if there is none)"""
+    return next((col for col in ID_COLUMNS if col in df.columns), None)
+
+def _quiet(*args, **kwargs):
+    """Stand-in for print when a step runs once per chunk"""
+
+def read_csv(file_path):
+    """Read a CSV with the PyArrow parser if installed, else pandas' C parser"""
+    if CSV_ENGINE == 'pyarrow':
+        return pd.read_csv(file_path, engine='pyarrow')
+    return pd.read_csv(file_path, low_memory=False)
+
+def write_table(df, name):
     """
-    Load all LinkedIn CSV files
+    Save a processed table as zstd Parquet (or CSV without pyarrow)
+    
+    Returns: Path of the written file
+    """
+    path = OUTPUT_DIR / f"{name}.{OUTPUT_FORMAT}"
+    if OUTPUT_FORMAT == 'parquet':
+        df.to_parquet(path, engine='pyarrow', compression='zstd', index=False, row_group_size=50_000)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+def load_linkedin_data(skip=()):
+    """
+    Load all LinkedIn CSV files (except the keys in `skip`)
     Returns: Dictionary of dataframes
     """
     print("📥 Loading LinkedIn dataset files...")
@@ -36,10 +78,12 @@ def load_linkedin_data():
     data = {}
     
     for key, filename in files.items():
+        if key in skip:
+            continue
         file_path = DATA_DIR / filename
         if file_path.exists():
             try:
-                df = pd.read_csv(file_path, low_memory=False)
+                df = read_csv(file_path)
                 data[key] = df
                 print(f"  ✅ Loaded {key}: {len(df):,} records")
             except Exception as e:
@@ -49,24 +93,30 @@ def load_linkedin_data():
     
     return data
 
-def explore_dataset(data):
+def explore_dataset(data, postings_summary=None):
     """
     Display dataset statistics and column information
+    
+    Postings come from data['postings'] when loaded, else from the
+    (rows, dtypes, missing counts) summary collected while streaming them
     """
     print("\n" + "="*60)
     print("📊 DATASET EXPLORATION")
     print("="*60)
     
-    # Postings (main file)
     if 'postings' in data:
         df = data['postings']
-        print(f"\n🎯 POSTINGS.CSV ({len(df):,} jobs)")
-        print(f"Columns: {list(df.columns)}")
+        postings_summary = (len(df), df.dtypes, df.isnull().sum())
+    
+    # Postings (main file)
+    if postings_summary is not None:
+        n_jobs, dtypes, missing = postings_summary
+        print(f"\n🎯 POSTINGS.CSV ({n_jobs:,} jobs)")
+        print(f"Columns: {list(dtypes.index)}")
         print(f"\nSample columns:")
-        for col in df.columns[:10]:
-            print(f"  • {col}: {df[col].dtype}")
+        for col, dtype in list(dtypes.items())[:10]:
+            print(f"  • {col}: {dtype}")
         print(f"\nMissing values:")
-        missing = df.isnull().sum()
         print(missing[missing > 0].head(10))
     
     # Job Skills
@@ -94,38 +144,20 @@ def explore_dataset(data):
         print(f"\n💰 SALARIES.CSV ({len(df):,} salary records)")
         print(f"Columns: {list(df.columns)}")
 
-def merge_job_data(data):
+def prepare_lookups(data):
     """
-    Merge postings with skills, companies, and salaries
-    Returns: Unified DataFrame
+    Build the tables joined onto the postings (companies, skills per job, salaries)
+    Returns: Dictionary of lookup tables
     """
-    print("\n" + "="*60)
-    print("🔗 MERGING DATASETS")
-    print("="*60)
-    
-    # Start with postings
-    df_jobs = data['postings'].copy()
-    print(f"\n1. Starting with {len(df_jobs):,} job postings")
+    lookups = {}
     
-    # Merge with companies (if available)
     if 'companies' in data:
-        df_companies = data['companies'].copy()
-        # Find common column (usually 'company_id')
-        company_id_col = 'company_id' if 'company_id' in df_jobs.columns else None
-        
-        if company_id_col:
-            df_jobs = df_jobs.merge(
-                df_companies, 
-                on=company_id_col, 
-                how='left', 
-                suffixes=('', '_company')
-            )
-            print(f"2. Merged with companies: {len(df_jobs):,} records")
+        lookups['companies'] = data['companies']
     
     # Aggregate skills per job
     if 'job_skills' in data and 'skills' in data:
-        df_job_skills = data['job_skills'].copy()
-        df_skills = data['skills'].copy()
+        df_job_skills = data['job_skills']
+        df_skills = data['skills']
         
         # Merge job_skills with skills to get skill names
         skill_id_col = 'skill_abr' if 'skill_abr' in df_job_skills.columns else 'skill_id'
@@ -140,19 +172,56 @@ def merge_job_data(data):
             
             # Aggregate skills per job
             job_id_col = 'job_id' if 'job_id' in df_job_skills.columns else 'posting_id'
-            skills_grouped = df_job_skills.groupby(job_id_col)[skill_name_col].apply(
-                lambda x: ', '.join(x.dropna().astype(str))
-            ).reset_index()
-            skills_grouped.columns = [job_id_col, 'required_skills']
-            
-            # Merge with main dataframe
-            df_jobs = df_jobs.merge(skills_grouped, on=job_id_col, how='left')
-            print(f"3. Merged with skills: {len(df_jobs):,} records")
+            # (builtin join per group instead of a Python lambda; jobs whose
+            # skills are all missing still get an empty string)
+            named = df_job_skills.dropna(subset=[skill_name_col])
+            skills_grouped = (
+                named[skill_name_col].astype(str)
+                .groupby(named[job_id_col])
+                .agg(', '.join)
+                .reindex(df_job_skills[job_id_col].dropna().unique(), fill_value='')
+                .rename('required_skills')
+            )
+            lookups['skills'] = (job_id_col, skills_grouped)
     
-    # Merge with salaries (if available)
     if 'salaries' in data:
-        df_salaries = data['salaries'].copy()
+        df_salaries = data['salaries']
         salary_job_id = 'job_id' if 'job_id' in df_salaries.columns else 'posting_id'
+        lookups['salaries'] = (salary_job_id, df_salaries)
+    
+    return lookups
+
+def process_chunk(df_jobs, lookups, verbose=False):
+    """
+    Join the lookup tables onto a frame of postings
+    Returns: Merged DataFrame
+    """
+    # Merge with companies (if available)
+    if 'companies' in lookups:
+        # Find common column (usually 'company_id')
+        company_id_col = 'company_id' if 'company_id' in df_jobs.columns else None
+        
+        if company_id_col:
+            df_jobs = df_jobs.merge(
+                lookups['companies'], 
+                on=company_id_col, 
+                how='left', 
+                suffixes=('', '_company')
+            )
+            if verbose:
+                print(f"2. Merged with companies: {len(df_jobs):,} records")
+    
+    # Merge with skills per job
+    if 'skills' in lookups:
+        job_id_col, skills_grouped = lookups['skills']
+        # Index join against the job-id-indexed skills (no merge keys or suffixes)
+        df_jobs = df_jobs.join(skills_grouped, on=job_id_col)
+        if verbose:
+            print(f"3. Merged with skills: {len(df_jobs):,} records")
+    
+    # Merge with salaries (if available)
+    if 'salaries' in lookups:
+        salary_job_id, df_salaries = lookups['salaries']
         
         if salary_job_id in df_jobs.columns:
             df_jobs = df_jobs.merge(
@@ -161,19 +230,22 @@ def merge_job_data(data):
                 how='left',
                 suffixes=('', '_salary')
             )
-            print(f"4. Merged with salaries: {len(df_jobs):,} records")
+            if verbose:
+                print(f"4. Merged with salaries: {len(df_jobs):,} records")
     
     return df_jobs
 
-def clean_job_data(df):
+def clean_job_data(df, verbose=True):
     """
     Clean and prepare job data for matching
     """
-    print("\n" + "="*60)
-    print("🧹 CLEANING DATA")
-    print("="*60)
+    log = print if verbose else _quiet
+    log("\n" + "="*60)
+    log("🧹 CLEANING DATA")
+    log("="*60)
     
-    df_clean = df.copy()
+    # (every step below returns a new frame, so the input is never modified)
+    df_clean = df
     
     # Identify important columns
     important_cols = []
@@ -183,7 +255,7 @@ def clean_job_data(df):
     for col in desc_cols:
         if col in df_clean.columns:
             important_cols.append(col)
-            print(f"  ✅ Found description column: {col}")
+            log(f"  ✅ Found description column: {col}")
             break
     
     # Job title column
@@ -191,7 +263,7 @@ def clean_job_data(df):
     for col in title_cols:
         if col in df_clean.columns:
             important_cols.append(col)
-            print(f"  ✅ Found title column: {col}")
+            log(f"  ✅ Found title column: {col}")
             break
     
     # Company column
@@ -199,20 +271,20 @@ def clean_job_data(df):
     for col in company_cols:
         if col in df_clean.columns:
             important_cols.append(col)
-            print(f"  ✅ Found company column: {col}")
+            log(f"  ✅ Found company column: {col}")
             break
     
     # Skills column
     if 'required_skills' in df_clean.columns:
         important_cols.append('required_skills')
-        print(f"  ✅ Found skills column: required_skills")
+        log(f"  ✅ Found skills column: required_skills")
     
     # Location column
     location_cols = ['location', 'job_location', 'city', 'work_location']
     for col in location_cols:
         if col in df_clean.columns:
             important_cols.append(col)
-            print(f"  ✅ Found location column: {col}")
+            log(f"  ✅ Found location column: {col}")
             break
     
     # Experience column
@@ -220,7 +292,7 @@ def clean_job_data(df):
     for col in exp_cols:
         if col in df_clean.columns:
             important_cols.append(col)
-            print(f"  ✅ Found experience column: {col}")
+            log(f"  ✅ Found experience column: {col}")
             break
     
     # Salary columns
@@ -235,83 +307,188 @@ def clean_job_data(df):
         before = len(df_clean)
         df_clean = df_clean.dropna(subset=[desc_col[0]])
         after = len(df_clean)
-        print(f"\n  🗑️  Removed {before - after:,} jobs with missing descriptions")
+        log(f"\n  🗑️  Removed {before - after:,} jobs with missing descriptions")
     
-    # Remove duplicates
+    # Remove duplicates (hashing only the posting id when there is one; rows
+    # repeated by a one-to-many join keep their first match)
     before = len(df_clean)
-    df_clean = df_clean.drop_duplicates()
+    id_col = find_id_column(df_clean)
+    if id_col:
+        df_clean = df_clean[~df_clean[id_col].duplicated()]
+    else:
+        df_clean = df_clean.drop_duplicates()
     after = len(df_clean)
     if before > after:
-        print(f"  🗑️  Removed {before - after:,} duplicate records")
+        log(f"  🗑️  Removed {before - after:,} duplicate records")
     
-    print(f"\n  ✅ Final dataset: {len(df_clean):,} clean job postings")
+    # Store text columns as Arrow strings (one UTF-8 buffer per column instead
+    # of a Python object per row); pandas 3 already does this by default
+    if CSV_ENGINE == 'pyarrow':
+        text_cols = [col for col in important_cols if df_clean[col].dtype == object]
+        if text_cols:
+            df_clean = df_clean.astype({col: pd.StringDtype("pyarrow") for col in text_cols})
+    
+    log(f"\n  ✅ Final dataset: {len(df_clean):,} clean job postings")
     
     return df_clean, important_cols
 
-def create_sample_dataset(df, n_samples=1000):
+def save_dataset_info(n_records, dtypes, important_cols):
     """
-    Create a smaller sample dataset for quick testing
+    Save column mapping info for the full dataset
     """
-    print("\n" + "="*60)
-    print("📦 CREATING SAMPLE DATASET")
-    print("="*60)
+    info_path = OUTPUT_DIR / "dataset_info.txt"
+    with open(info_path, 'w', encoding='utf-8') as f:
+        f.write("LinkedIn Dataset Information\n")
+        f.write("="*60 + "\n\n")
+        f.write(f"Total Records: {n_records:,}\n")
+        f.write(f"Total Columns: {len(dtypes)}\n\n")
+        f.write("Important Columns:\n")
+        for col in important_cols:
+            f.write(f"  • {col}\n")
+        f.write(f"\nAll Columns:\n")
+        for col, dtype in dtypes.items():
+            f.write(f"  • {col}: {dtype}\n")
+    print(f"  ✅ Saved dataset info: {info_path}")
+
+# ==========================================
+# CHUNKED PROCESSING
+# ==========================================
+
+class ChunkedTableWriter:
+    """
+    Append DataFrame chunks to a processed output
     
-    if len(df) > n_samples:
-        df_sample = df.sample(n=n_samples, random_state=42)
-        print(f"  ✅ Created sample with {n_samples:,} jobs")
-    else:
-        df_sample = df.copy()
-        print(f"  ⚠️  Dataset has only {len(df):,} jobs (kept all)")
+    Parquet output is a directory with one part file per chunk (chunks may
+    infer different dtypes, so they are not forced into one schema); CSV
+    output is a single appended file
+    """
     
-    return df_sample
+    def __init__(self, name):
+        if OUTPUT_FORMAT == 'parquet':
+            # A single-file output from an earlier run would shadow this one
+            stale_path = OUTPUT_DIR / f"{name}.parquet"
+            if stale_path.exists():
+                stale_path.unlink()
+            
+            self.path = OUTPUT_DIR / name
+            self.path.mkdir(parents=True, exist_ok=True)
+            for old_part in self.path.glob("part-*.parquet"):
+                old_part.unlink()
+        else:
+            self.path = OUTPUT_DIR / f"{name}.csv"
+        self.parts = 0
+        self.records = 0
+    
+    def write(self, df):
+        """Append one chunk"""
+        if OUTPUT_FORMAT == 'parquet':
+            part_path = self.path / f"part-{self.parts:05d}.parquet"
+            df.to_parquet(part_path, engine='pyarrow', compression='zstd', index=False)
+        else:
+            df.to_csv(self.path, mode='w' if self.parts == 0 else 'a', header=self.parts == 0, index=False)
+        self.parts += 1
+        self.records += len(df)
+
+def iter_postings(chunksize=POSTINGS_CHUNK_SIZE):
+    """
+    Read postings.csv in chunks of `chunksize` rows
+    (the PyArrow engine cannot read in chunks, so this uses pandas' C parser)
+    """
+    return pd.read_csv(DATA_DIR / 'postings.csv', chunksize=chunksize, low_memory=False)
 
-def save_processed_data(df_full, df_sample, important_cols):
+def process_postings_in_chunks(lookups, n_samples=1000):
     """
-    Save processed datasets
+    Merge, clean and save the postings one chunk at a time
+    
+    Memory stays proportional to the chunk size: rows already seen in an
+    earlier chunk are dropped by row hash, and the sample keeps the
+    n_samples rows with the smallest random keys (a uniform sample)
+    
+    Returns: (rows, dtypes, missing counts) of the raw postings for
+    explore_dataset, or None if there are none
     """
     print("\n" + "="*60)
-    print("💾 SAVING PROCESSED DATA")
+    print("🔗 PROCESSING POSTINGS IN CHUNKS")
     print("="*60)
     
-    # Create output directory
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     
-    # Save full dataset
-    full_path = OUTPUT_DIR / "linkedin_jobs_full.csv"
-    df_full.to_csv(full_path, index=False)
-    print(f"  ✅ Saved full dataset: {full_path}")
-    print(f"     Records: {len(df_full):,}")
-    print(f"     Columns: {len(df_full.columns)}")
+    full_writer = ChunkedTableWriter("linkedin_jobs_full")
+    light_writer = None
+    important_cols = []
+    dtypes = None
+    seen_hashes = np.empty(0, dtype=np.uint64)
+    rng = np.random.default_rng(42)
+    df_sample = None
+    n_postings = 0
+    postings_dtypes = None
+    postings_missing = None
+    
+    for i, chunk in enumerate(iter_postings(), start=1):
+        # Raw postings statistics for explore_dataset
+        n_postings += len(chunk)
+        chunk_missing = chunk.isnull().sum()
+        if postings_missing is None:
+            postings_dtypes, postings_missing = chunk.dtypes, chunk_missing
+        else:
+            postings_missing = postings_missing.add(chunk_missing, fill_value=0).astype(int)
+        
+        df_chunk = process_chunk(chunk, lookups)
+        df_chunk, important_cols = clean_job_data(df_chunk, verbose=False)
+        
+        # Drop duplicates of rows from earlier chunks (by posting id if present)
+        id_col = find_id_column(df_chunk)
+        key = df_chunk[id_col] if id_col else df_chunk
+        hashes = pd.util.hash_pandas_object(key, index=False).to_numpy()
+        is_new = ~np.isin(hashes, seen_hashes)
+        df_chunk = df_chunk[is_new]
+        seen_hashes = np.union1d(seen_hashes, hashes[is_new])
+        
+        full_writer.write(df_chunk)
+        if important_cols:
+            if light_writer is None:
+                light_writer = ChunkedTableWriter("linkedin_jobs_light")
+            light_writer.write(df_chunk[important_cols])
+        if dtypes is None:
+            dtypes = df_chunk.dtypes
+        
+        # Keep the rows with the n_samples smallest random keys seen so far.
+        # Once the sample is full, only rows whose key beats its largest key
+        # are copied, so later chunks add almost nothing
+        keys = rng.random(len(df_chunk))
+        new_rows = df_chunk
+        if df_sample is not None and len(df_sample) == n_samples:
+            beats_sample = keys < df_sample['_sample_key'].iat[-1]
+            new_rows, keys = new_rows[beats_sample], keys[beats_sample]
+        candidates = new_rows.assign(_sample_key=keys)
+        if df_sample is not None:
+            candidates = pd.concat([df_sample, candidates], ignore_index=True)
+        df_sample = candidates.nsmallest(n_samples, '_sample_key')
+        
+        print(f"  ✅ Chunk {i}: {len(chunk):,} postings → {len(df_chunk):,} clean ({full_writer.records:,} total)")
+    
+    if df_sample is None:
+        print("  ⚠️  No postings found")
+        return None
     
-    # Save sample dataset
-    sample_path = OUTPUT_DIR / "linkedin_jobs_sample.csv"
-    df_sample.to_csv(sample_path, index=False)
+    df_sample = df_sample.drop(columns='_sample_key')
+    
+    print(f"  ✅ Saved full dataset: {full_writer.path}")
+    print(f"     Records: {full_writer.records:,}")
+    print(f"     Columns: {len(dtypes)}")
+    
+    sample_path = write_table(df_sample, "linkedin_jobs_sample")
     print(f"  ✅ Saved sample dataset: {sample_path}")
     print(f"     Records: {len(df_sample):,}")
     
-    # Save important columns only (lightweight version)
-    if important_cols:
-        df_light = df_full[important_cols].copy()
-        light_path = OUTPUT_DIR / "linkedin_jobs_light.csv"
-        df_light.to_csv(light_path, index=False)
-        print(f"  ✅ Saved lightweight dataset: {light_path}")
-        print(f"     Records: {len(df_light):,}")
+    if light_writer is not None:
+        print(f"  ✅ Saved lightweight dataset: {light_writer.path}")
+        print(f"     Records: {light_writer.records:,}")
         print(f"     Columns: {important_cols}")
     
-    # Save column mapping info
-    info_path = OUTPUT_DIR / "dataset_info.txt"
-    with open(info_path, 'w', encoding='utf-8') as f:
-        f.write("LinkedIn Dataset Information\n")
-        f.write("="*60 + "\n\n")
-        f.write(f"Total Records: {len(df_full):,}\n")
-        f.write(f"Total Columns: {len(df_full.columns)}\n\n")
-        f.write("Important Columns:\n")
-        for col in important_cols:
-            f.write(f"  • {col}\n")
-        f.write(f"\nAll Columns:\n")
-        for col in df_full.columns:
-            f.write(f"  • {col}: {df_full[col].dtype}\n")
-    print(f"  ✅ Saved dataset info: {info_path}")
+    save_dataset_info(full_writer.records, dtypes, important_cols)
+    
+    return n_postings, postings_dtypes, postings_missing
 
 def main():
     """
@@ -321,35 +498,26 @@ def main():
     print("🚀 LINKEDIN DATASET PROCESSOR")
     print("="*60)
     
-    # Load data
-    data = load_linkedin_data()
+    # Load lookup tables (postings are streamed in chunks below)
+    data = load_linkedin_data(skip=('postings',))
     
-    if not data:
-        print("\n❌ No data files found! Check your data directory.")
+    if not (DATA_DIR / 'postings.csv').exists():
+        print("\n❌ No postings file found! Check your data directory.")
         return
     
-    # Explore dataset
-    explore_dataset(data)
-    
-    # Merge datasets
-    df_merged = merge_job_data(data)
-    
-    # Clean data
-    df_clean, important_cols = clean_job_data(df_merged)
-    
-    # Create sample
-    df_sample = create_sample_dataset(df_clean, n_samples=1000)
+    # Merge, clean, sample and save the postings chunk by chunk
+    postings_summary = process_postings_in_chunks(prepare_lookups(data), n_samples=1000)
     
-    # Save processed data
-    save_processed_data(df_clean, df_sample, important_cols)
+    # Explore dataset (postings statistics were collected while streaming)
+    explore_dataset(data, postings_summary)
     
     print("\n" + "="*60)
     print("✅ PROCESSING COMPLETE!")
     print("="*60)
     print("\n📁 Output files created in: data/processed/")
-    print("  • linkedin_jobs_full.csv - Complete dataset")
-    print("  • linkedin_jobs_sample.csv - 1000 job sample")
-    print("  • linkedin_jobs_light.csv - Important columns only")
+    print(f"  • linkedin_jobs_full{'/' if OUTPUT_FORMAT == 'parquet' else '.csv'} - Complete dataset")
+    print(f"  • linkedin_jobs_sample.{OUTPUT_FORMAT} - 1000 job sample")
+    print(f"  • linkedin_jobs_light{'/' if OUTPUT_FORMAT == 'parquet' else '.csv'} - Important columns only")
     print("  • dataset_info.txt - Dataset documentation")
     print("\n💡 Use the sample dataset for quick testing!")
     print("💡 Use the light dataset for faster loading!")
@@ -3,11 +3,11 @@ Data Loader - Load and cache datasets
 """
 
 import pandas as pd
-import json
 from pathlib import Path
 import streamlit as st
 from config.paths import *
 from config.settings import USE_SAMPLE_DATA, CACHE_DATA
+from utils.skills_loader import load_skills_database
 
 # ==========================================
 # LOAD RESUMES
@@ -38,59 +38,69 @@ def load_job_dataset(sample=USE_SAMPLE_DATA):
         st.info("💡 Run: python process_linkedin_data.py")
         return None
     
-    df = pd.read_csv(job_file)
+    if job_file.is_dir():
+        # Parquet parts written chunk by chunk (dtypes may differ per part)
+        parts = sorted(job_file.glob('part-*.parquet'))
+        df = pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+    elif job_file.suffix == '.parquet':
+        df = pd.read_parquet(job_file)
+    else:
+        df = pd.read_csv(job_file)
     print(f"✅ Loaded {len(df)} jobs")
     return df
 
 # ==========================================
-# LOAD SKILLS DATABASE
+# LOAD SAMPLE DATA
 # ==========================================
 
-@st.cache_data
-def load_skills_database():
-    """Load skills JSON database"""
-    if not SKILLS_DATABASE.exists():
-        st.warning(f"⚠️  Skills database not found: {SKILLS_DATABASE}")
-        return {}
+def _iter_records(path: Path):
+    """
+    Yield the non-empty '---'-separated records of a text file, one at a time
     
-    with open(SKILLS_DATABASE, 'r') as f:
-        skills = json.load(f)
+    Reads line by line (a separator never spans lines), so only the current
+    record is held in memory
+    """
+    buffer = []
     
-    # Flatten to a single list
-    all_skills = []
-    for category, skill_list in skills.items():
-        all_skills.extend(skill_list)
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if '---' not in line:
+                buffer.append(line)
+                continue
+            
+            # Same pieces as content.split('---')
+            *ends, rest = line.split('---')
+            for piece in ends:
+                buffer.append(piece)
+                record = ''.join(buffer).strip()
+                if record:
+                    yield record
+                buffer = []
+            buffer.append(rest)
     
-    print(f"✅ Loaded {len(all_skills)} skills")
-    return all_skills
+    record = ''.join(buffer).strip()
+    if record:
+        yield record
 
-# ==========================================
-# LOAD SAMPLE DATA
-# ==========================================
+def iter_sample_resumes():
+    """Yield sample resumes one at a time"""
+    if not SAMPLE_RESUMES.exists():
+        return
+    yield from _iter_records(SAMPLE_RESUMES)
+
+def iter_sample_jobs():
+    """Yield sample job descriptions one at a time"""
+    if not SAMPLE_JOBS.exists():
+        return
+    yield from _iter_records(SAMPLE_JOBS)
 
 def load_sample_resumes():
     """Load sample resume text file"""
-    if not SAMPLE_RESUMES.exists():
-        return []
-    
-    with open(SAMPLE_RESUMES, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Split by separator
-    resumes = content.split('---')
-    return [r.strip() for r in resumes if r.strip()]
+    return list(iter_sample_resumes())
 
 def load_sample_jobs():
     """Load sample job descriptions"""
-    if not SAMPLE_JOBS.exists():
-        return []
-    
-    with open(SAMPLE_JOBS, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Split by separator
-    jobs = content.split('---')
-    return [j.strip() for j in jobs if j.strip()]
+    return list(iter_sample_jobs())
 
 # ==========================================
 # HELPER FUNCTIONS
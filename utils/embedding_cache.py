@@ -0,0 +1,223 @@
+"""
+Embedding Cache - Persist Sentence-BERT embeddings on disk
+Embeddings are keyed by model name and SHA-1 of the text, so only new
+texts pay the encoding cost. Recently used vectors are also kept in memory
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+from config.paths import EMBEDDING_CACHE_DIR
+from config.settings import (SENTENCE_TRANSFORMER_MODEL, EMBEDDING_BATCH_SIZE, EMBEDDING_MEMORY_CACHE_SIZE,
+                             EMBEDDING_DISK_CACHE_MAX_FILES)
+
+# In-memory LRU: (namespace, text) -> embedding
+_memory_cache = OrderedDict()
+_memory_lock = threading.Lock()
+
+# Cached files per namespace directory (counted on first write, then tracked)
+_disk_counts = {}
+_disk_lock = threading.Lock()
+
+# One model.encode at a time per process: concurrent sessions would otherwise
+# split the CPU between several torch thread pools. Cache lookups and writes
+# run outside it
+_encode_lock = threading.Lock()
+
+# Pruning keeps this fraction of the cap, so it does not run on every write
+_DISK_PRUNE_TARGET = 0.9
+
+# ==========================================
+# CACHE FILES
+# ==========================================
+
+def get_cache_namespace(model) -> str:
+    """Cache namespace for a model (set by the loader for non-default variants)"""
+    return getattr(model, 'cache_namespace', SENTENCE_TRANSFORMER_MODEL)
+
+def get_cache_path(text: str, namespace: str = SENTENCE_TRANSFORMER_MODEL) -> Path:
+    """Get the cache file for a text's embedding"""
+    digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+    return EMBEDDING_CACHE_DIR / namespace / f"{digest}.npy"
+
+def _load_cached(path: Path):
+    """Load a cached embedding (None if missing or unreadable)"""
+    try:
+        embedding = np.load(path)
+        # Mark the file as recently used, so pruning removes unused ones first
+        os.utime(path)
+        return embedding
+    except (OSError, ValueError):
+        return None
+
+def _save_cached(path: Path, embedding: np.ndarray) -> bool:
+    """
+    Save an embedding atomically (a failed write only loses the cache entry)
+    
+    Returns:
+        True if the file was written
+    """
+    tmp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, embedding)
+        os.replace(tmp_path, path)
+        tmp_path = None
+        return True
+    except OSError as e:
+        print(f"⚠️  Could not cache embedding: {e}")
+        return False
+    finally:
+        # Never leave a partial temp file behind, whatever the failure
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+def _count_cache_files(directory: Path) -> int:
+    """Number of cached embeddings in a namespace directory"""
+    try:
+        with os.scandir(directory) as entries:
+            return sum(1 for entry in entries if entry.name.endswith('.npy'))
+    except OSError:
+        return 0
+
+def _prune_disk_cache(directory: Path, max_files: int = EMBEDDING_DISK_CACHE_MAX_FILES) -> int:
+    """
+    Delete the least recently used cache files of a namespace directory
+    
+    Args:
+        directory: Namespace directory of .npy files
+        max_files: Files allowed before pruning; pruning keeps 90% of this
+    
+    Returns:
+        Number of files left
+    """
+    try:
+        with os.scandir(directory) as entries:
+            files = [(entry.stat().st_mtime, entry.path) for entry in entries if entry.name.endswith('.npy')]
+    except OSError:
+        return 0
+    
+    if len(files) <= max_files:
+        return len(files)
+    
+    files.sort()
+    keep = int(max_files * _DISK_PRUNE_TARGET)
+    removed = 0
+    for _, file_path in files[:len(files) - keep]:
+        try:
+            os.unlink(file_path)
+            removed += 1
+        except OSError:
+            pass
+    
+    print(f"🧹 Pruned {removed:,} cached embeddings from {directory}")
+    return len(files) - removed
+
+def _record_disk_writes(directory: Path, n_written: int):
+    """Track new files in a namespace directory, pruning it once over the cap"""
+    with _disk_lock:
+        if directory not in _disk_counts:
+            # First write this process: count what earlier runs left
+            _disk_counts[directory] = _count_cache_files(directory)
+        else:
+            _disk_counts[directory] += n_written
+        
+        if _disk_counts[directory] > EMBEDDING_DISK_CACHE_MAX_FILES:
+            _disk_counts[directory] = _prune_disk_cache(directory)
+
+# ==========================================
+# MEMORY CACHE
+# ==========================================
+
+def _memory_get(key):
+    """Get an embedding from the in-memory LRU (None if missing)"""
+    with _memory_lock:
+        embedding = _memory_cache.get(key)
+        if embedding is not None:
+            _memory_cache.move_to_end(key)
+        return embedding
+
+def _memory_put(key, embedding: np.ndarray):
+    """Add an embedding to the in-memory LRU, evicting the oldest entries"""
+    with _memory_lock:
+        _memory_cache[key] = embedding
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > EMBEDDING_MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+# ==========================================
+# EMBEDDING LOOKUP
+# ==========================================
+
+def get_embeddings(texts: list, model) -> np.ndarray:
+    """
+    Get normalized embeddings for texts, encoding only cache misses
+    
+    Args:
+        texts: List of texts
+        model: Sentence-BERT model
+    
+    Returns:
+        Contiguous float32 array of shape (len(texts), embedding_dim)
+    """
+    namespace = get_cache_namespace(model)
+    embeddings = [None] * len(texts)
+    pending = {}  # text -> indices still needing an embedding
+    
+    for i, text in enumerate(texts):
+        embedding = _memory_get((namespace, text))
+        if embedding is None:
+            embedding = _load_cached(get_cache_path(text, namespace))
+            if embedding is not None:
+                _memory_put((namespace, text), embedding)
+        
+        if embedding is None:
+            pending.setdefault(text, []).append(i)
+        else:
+            embeddings[i] = embedding
+    
+    # Encode all misses in one batch
+    if pending:
+        new_texts = list(pending)
+        with _encode_lock:
+            new_embeddings = model.encode(
+                new_texts,
+                batch_size=EMBEDDING_BATCH_SIZE,
+                normalize_embeddings=True,
+                convert_to_numpy=True
+            )
+        new_embeddings = new_embeddings.astype(np.float32, copy=False)
+        
+        n_written = 0
+        for text, embedding in zip(new_texts, new_embeddings):
+            n_written += _save_cached(get_cache_path(text, namespace), embedding)
+            _memory_put((namespace, text), embedding)
+            for i in pending[text]:
+                embeddings[i] = embedding
+        
+        if n_written:
+            _record_disk_writes(EMBEDDING_CACHE_DIR / namespace, n_written)
+    
+    # float32 rows keep similarity a single BLAS sdot (old cache files may differ)
+    return np.ascontiguousarray(np.stack(embeddings), dtype=np.float32)
+
+def get_embedding(text: str, model) -> np.ndarray:
+    """Get the normalized embedding for a single text"""
+    return get_embeddings([text], model)[0]
+
+# ==========================================
+# TESTING
+# ==========================================
+
+if __name__ == "__main__":
+    print("✅ Embedding cache ready!")
+    print(f"\nCache directory: {EMBEDDING_CACHE_DIR / SENTENCE_TRANSFORMER_MODEL}")
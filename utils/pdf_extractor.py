@@ -5,12 +5,74 @@ PDF Extractor - Extract text from PDF files
 import pdfplumber
 from pathlib import Path
 from typing import Optional
-from config.settings import MAX_PDF_PAGES
+from config.settings import MAX_PDF_PAGES, MAX_TEXT_LENGTH
+
+# Optional: PDFium (C library) text extraction, much faster than pdfminer
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
 
 # ==========================================
 # PDF EXTRACTION
 # ==========================================
 
+def _extract_pdf_pages(pdf, max_pages: int = MAX_PDF_PAGES) -> str:
+    """
+    Extract text page by page from an open PDF
+    
+    Stops after max_pages, or as soon as MAX_TEXT_LENGTH characters have
+    been collected, so later pages are never parsed
+    """
+    chunks = []
+    total_length = 0
+    
+    for page in pdf.pages[:max_pages]:
+        page_text = page.extract_text()
+        if page_text:
+            chunks.append(page_text)
+            total_length += len(page_text)
+            if total_length >= MAX_TEXT_LENGTH:
+                break
+    
+    return "\n\n".join(chunks).strip()
+
+def _extract_pdfium_pages(source, max_pages: int = MAX_PDF_PAGES) -> str:
+    """
+    _extract_pdf_pages using PDFium
+    
+    Args:
+        source: Path or PDF bytes
+        max_pages: Maximum pages to extract
+    
+    Returns:
+        Extracted text ("" if PDFium is not installed or finds no text)
+    """
+    if pdfium is None:
+        return ""
+    
+    chunks = []
+    total_length = 0
+    pdf = pdfium.PdfDocument(source)
+    
+    try:
+        for i in range(min(len(pdf), max_pages)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            page_text = textpage.get_text_range().replace('\r\n', '\n')
+            textpage.close()
+            page.close()
+            
+            if page_text.strip():
+                chunks.append(page_text)
+                total_length += len(page_text)
+                if total_length >= MAX_TEXT_LENGTH:
+                    break
+    finally:
+        pdf.close()
+    
+    return "\n\n".join(chunks).strip()
+
 def extract_text_from_pdf(pdf_path: str, max_pages: int = MAX_PDF_PAGES) -> str:
     """
     Extract text from PDF file
@@ -23,22 +85,26 @@ def extract_text_from_pdf(pdf_path: str, max_pages: int = MAX_PDF_PAGES) -> str:
         Extracted text
     """
     try:
-        text = ""
-        with pdfplumber.open(pdf_path) as pdf:
-            num_pages = min(len(pdf.pages), max_pages)
-            
-            for i in range(num_pages):
-                page = pdf.pages[i]
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n\n"
-        
-        return text.strip()
+        return _extract_text_from_pdf_path(str(pdf_path), max_pages)
     
     except Exception as e:
         print(f"❌ Error extracting PDF: {e}")
         return ""
 
+def _extract_text_from_pdf_path(pdf_path: str, max_pages: int) -> str:
+    """Extract text with PDFium, falling back to pdfplumber when it finds none"""
+    try:
+        text = _extract_pdfium_pages(pdf_path, max_pages)
+    except Exception as e:
+        print(f"⚠️  PDFium could not read PDF, using pdfplumber: {e}")
+        text = ""
+    
+    if text:
+        return text
+    
+    with pdfplumber.open(pdf_path) as pdf:
+        return _extract_pdf_pages(pdf, max_pages)
+
 def extract_text_from_uploaded_pdf(uploaded_file) -> str:
     """
     Extract text from Streamlit uploaded PDF file
@@ -50,14 +116,18 @@ def extract_text_from_uploaded_pdf(uploaded_file) -> str:
         Extracted text
     """
     try:
-        text = ""
-        with pdfplumber.open(uploaded_file) as pdf:
-            for page in pdf.pages[:MAX_PDF_PAGES]:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n\n"
+        try:
+            text = _extract_pdfium_pages(uploaded_file.getvalue())
+        except Exception as e:
+            print(f"⚠️  PDFium could not read PDF, using pdfplumber: {e}")
+            text = ""
         
-        return text.strip()
+        if text:
+            return text
+        
+        uploaded_file.seek(0)
+        with pdfplumber.open(uploaded_file) as pdf:
+            return _extract_pdf_pages(pdf)
     
     except Exception as e:
         print(f"❌ Error extracting uploaded PDF: {e}")
@@ -0,0 +1,69 @@
+"""
+Skills Loader - Load the skills database
+Kept free of Streamlit so parsing and matching work in scripts and
+worker processes; the app shows its own warning when the file is missing
+"""
+
+import json
+from functools import lru_cache
+from itertools import chain
+from config.paths import SKILLS_DATABASE
+
+# Optional: faster JSON parsing
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ==========================================
+# LOAD SKILLS DATABASE
+# ==========================================
+
+def get_skills_database_mtime():
+    """Modification time of the skills database (None if it is missing)"""
+    try:
+        return SKILLS_DATABASE.stat().st_mtime
+    except OSError:
+        return None
+
+def load_skills_database():
+    """
+    Load skills JSON database
+    
+    Cached per process until the file changes. Every caller gets the same
+    tuple of skills (empty if the file is missing)
+    """
+    mtime = get_skills_database_mtime()
+    if mtime is None:
+        _warn_missing_database(str(SKILLS_DATABASE))
+        return ()
+    
+    return _load_skills_file(mtime)
+
+@lru_cache(maxsize=1)
+def _warn_missing_database(path: str):
+    """Report a missing skills database once per path"""
+    print(f"⚠️  Skills database not found: {path}")
+
+@lru_cache(maxsize=1)
+def _load_skills_file(mtime: float) -> tuple:
+    """Parse and flatten the skills JSON (keyed by modification time)"""
+    if orjson is not None:
+        skills = orjson.loads(SKILLS_DATABASE.read_bytes())
+    else:
+        with open(SKILLS_DATABASE, 'r') as f:
+            skills = json.load(f)
+    
+    # Flatten to a single tuple
+    all_skills = tuple(chain.from_iterable(skills.values()))
+    
+    print(f"✅ Loaded {len(all_skills)} skills")
+    return all_skills
+
+# ==========================================
+# TESTING
+# ==========================================
+
+if __name__ == "__main__":
+    skills = load_skills_database()
+    print(f"Sample skills: {skills[:10]}")
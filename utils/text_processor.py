@@ -4,26 +4,91 @@ Text Processor - Clean and preprocess text data
 
 import re
 import string
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import List
+import numpy as np
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 
-# Download required NLTK data (run once)
+# Optional: RE2 (linear-time regex engine) for patterns that can backtrack badly
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+    import re2
+except ImportError:
+    re2 = None
 
+# Download required NLTK data (run once)
 try:
     nltk.data.find('corpora/stopwords')
 except LookupError:
     nltk.download('stopwords', quiet=True)
 
+# ==========================================
+# COMPILED PATTERNS
+# ==========================================
+
+_CLEAN_URL_RE = re.compile(r'http\S+|www\S+')
+_CLEAN_EMAIL_RE = re.compile(r'\S+@\S+')
+_CLEAN_PHONE_RE = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+_SPECIAL_CHARS_RE = re.compile(r'[^a-zA-Z0-9\s]')
+_NON_ALNUM_RE = re.compile(r'[^a-zA-Z0-9]')
+
+# Word tokens; inner . / + # - stay attached (node.js, ci/cd, c++, c#,
+# data-driven) as with word_tokenize, other punctuation is dropped
+_TOKEN_RE = re.compile(r'\w+(?:[./+#-]\w+)*[+#]*')
+
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+# The pieces _SENTENCE_SPLIT_RE splits text into, minus the empty ones
+_SENTENCE_RE = re.compile(r'[^.!?]+')
+
+# The overlapping local/domain classes make re's search quadratic on long
+# runs like 'a.a.a...@' (about 0.1s for 8 KB), RE2 matches in linear time
+_EMAIL_RE = (re2 or re).compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_PHONE_RE = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+# One character class with the same members as the original alternation
+# [a-zA-Z]|[0-9]|[$-_@.&+]|[!*\(),]|%XX: the $-_ range already covers
+# digits, upper case, @ . & + * ( ) , \ and %, leaving only ! and a-z
+_URL_RE = re.compile(r'https?://[!$-_a-z]+')
+
+# Years of experience, tried in order ("5 years", "5+ years", "5-7 years")
+_YOE_PATTERNS = [re.compile(p) for p in (
+    r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
+    r'(\d+)\+?\s*yrs?\s+(?:of\s+)?experience',
+    r'experience[:\s]+(\d+)\+?\s*years?',
+    r'(\d+)-\d+\s*years?\s+(?:of\s+)?experience'
+)]
+
+# Section keywords, matched as substrings of the lowercased text.
+# 'technical skills' is left out of skills: it contains 'skills', so it can
+# never decide the result on its own
+_SECTION_KEYWORDS = (
+    ('summary', ('summary', 'objective', 'profile')),
+    ('experience', ('experience', 'work history', 'employment')),
+    ('education', ('education', 'academic', 'degree')),
+    ('skills', ('skills', 'competencies')),
+    ('projects', ('projects', 'portfolio')),
+    ('certifications', ('certifications', 'certificates', 'licensed')),
+)
+
 # ==========================================
 # TEXT CLEANING
 # ==========================================
 
+@lru_cache(maxsize=1)
+def _stop_words() -> frozenset:
+    """English stopwords, loaded from NLTK once per process"""
+    return frozenset(stopwords.words('english'))
+
+@lru_cache(maxsize=512)
+def lower_text(text: str) -> str:
+    """
+    Lowercased text, memoized so the extractors run over one document
+    (cleaning, experience, sections, education, job type...) share a single
+    lowercased copy instead of each lowering it again
+    """
+    return text.lower()
+
 def clean_text(text: str, remove_stops: bool = False) -> str:
     """
     Clean and normalize text
@@ -39,36 +104,38 @@ def clean_text(text: str, remove_stops: bool = False) -> str:
         return ""
     
     # Convert to lowercase
-    text = text.lower()
+    text = lower_text(text)
     
-    # Remove URLs
-    text = re.sub(r'http\S+|www\S+', '', text)
+    # Remove URLs (skip the scan when none can match)
+    if 'http' in text or 'www' in text:
+        text = _CLEAN_URL_RE.sub('', text)
     
     # Remove emails
-    text = re.sub(r'\S+@\S+', '', text)
+    if '@' in text:
+        text = _CLEAN_EMAIL_RE.sub('', text)
     
     # Remove phone numbers
-    text = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', '', text)
+    text = _CLEAN_PHONE_RE.sub('', text)
     
     # Remove extra whitespace
     text = ' '.join(text.split())
     
     # Remove stopwords if requested
     if remove_stops:
-        stop_words = set(stopwords.words('english'))
-        words = word_tokenize(text)
+        stop_words = _stop_words()
+        words = tokenize(text)
         text = ' '.join([w for w in words if w not in stop_words])
     
     return text.strip()
 
+def tokenize(text: str) -> List[str]:
+    """Split text into word tokens (compiled regex, no NLTK models needed)"""
+    return _TOKEN_RE.findall(text)
+
 def remove_special_characters(text: str, keep_spaces: bool = True) -> str:
     """Remove special characters from text"""
-    if keep_spaces:
-        pattern = r'[^a-zA-Z0-9\s]'
-    else:
-        pattern = r'[^a-zA-Z0-9]'
-    
-    return re.sub(pattern, '', text)
+    pattern = _SPECIAL_CHARS_RE if keep_spaces else _NON_ALNUM_RE
+    return pattern.sub('', text)
 
 def normalize_whitespace(text: str) -> str:
     """Normalize whitespace to single spaces"""
@@ -80,26 +147,52 @@ def normalize_whitespace(text: str) -> str:
 
 def extract_keywords(text: str, top_n: int = 20) -> List[str]:
     """Extract top keywords from text (simple frequency-based)"""
-    # Clean text
-    text = clean_text(text, remove_stops=True)
-    
-    # Tokenize
-    words = word_tokenize(text.lower())
+    return list(_extract_keywords_cached(text, top_n))
+
+@lru_cache(maxsize=1024)
+def _extract_keywords_cached(text: str, top_n: int) -> tuple:
+    """extract_keywords, memoized per (text, top_n) as an immutable tuple"""
+    # Clean text (already lowercased)
+    text = clean_text(text)
     
-    # Filter words (length > 3, alphanumeric)
-    words = [w for w in words if len(w) > 3 and w.isalnum()]
+    # Tokenize once and apply the stopword, length (> 3) and alphanumeric
+    # filters together, instead of rejoining the non-stopwords into a string
+    # and tokenizing that again
+    stop_words = _stop_words()
+    words = (w for w in tokenize(text) if len(w) > 3 and w.isalnum() and w not in stop_words)
     
-    # Count frequency
-    from collections import Counter
+    # Count frequency (filtered words stream straight into the counter)
     word_freq = Counter(words)
     
     # Get top N
-    return [word for word, _ in word_freq.most_common(top_n)]
+    return tuple(_top_n_words(word_freq, top_n))
+
+def _top_n_words(word_freq, top_n: int) -> List[str]:
+    """
+    Same result as most_common(top_n), using a partial partition
+    
+    Ties on the cut-off count keep first-seen order, as Counter does
+    """
+    if top_n <= 0 or top_n >= len(word_freq):
+        return [word for word, _ in word_freq.most_common(top_n)]
+    
+    vocab = list(word_freq)
+    counts = np.fromiter(word_freq.values(), dtype=np.int64, count=len(vocab))
+    
+    # Count of the top_n-th most frequent word
+    kth = len(counts) - top_n
+    cutoff = np.partition(counts, kth)[kth]
+    
+    # Sort candidates by count (desc), then by first occurrence
+    candidates = np.flatnonzero(counts >= cutoff)
+    order = candidates[np.lexsort((candidates, -counts[candidates]))][:top_n]
+    
+    return [vocab[i] for i in order]
 
 def extract_sentences(text: str, max_sentences: int = None) -> List[str]:
     """Extract sentences from text"""
     # Simple sentence splitting
-    sentences = re.split(r'[.!?]+', text)
+    sentences = _SENTENCE_SPLIT_RE.split(text)
     sentences = [s.strip() for s in sentences if s.strip()]
     
     if max_sentences:
@@ -119,42 +212,48 @@ def get_char_count(text: str) -> int:
     return len(text)
 
 def get_sentence_count(text: str) -> int:
-    """Count sentences in text"""
-    return len(extract_sentences(text))
+    """Count sentences in text (same count as extract_sentences, no list built)"""
+    return sum(1 for match in _SENTENCE_RE.finditer(text) if not match.group().isspace())
 
 # ==========================================
 # RESUME/JOB SPECIFIC
 # ==========================================
 
+@lru_cache(maxsize=1024)
 def extract_email(text: str) -> str:
     """Extract email address from text"""
-    match = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    # Cheap pre-check: skip the regex scan when no address can match
+    if '@' not in text:
+        return ""
+    match = _EMAIL_RE.search(text)
     return match.group(0) if match else ""
 
+@lru_cache(maxsize=1024)
 def extract_phone(text: str) -> str:
     """Extract phone number from text"""
-    match = re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text)
+    match = _PHONE_RE.search(text)
     return match.group(0) if match else ""
 
 def extract_urls(text: str) -> List[str]:
     """Extract URLs from text"""
-    return re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', text)
+    if 'http' not in text:
+        return []
+    return _URL_RE.findall(text)
 
+@lru_cache(maxsize=1024)
 def extract_years_of_experience(text: str) -> int:
     """
     Extract years of experience from text
     Looks for patterns like "5 years", "5+ years", "5-7 years"
     """
-    # Common patterns
-    patterns = [
-        r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-        r'(\d+)\+?\s*yrs?\s+(?:of\s+)?experience',
-        r'experience[:\s]+(\d+)\+?\s*years?',
-        r'(\d+)-\d+\s*years?\s+(?:of\s+)?experience'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text.lower())
+    text_lower = lower_text(text)
+    
+    # Every pattern needs the word
+    if 'experience' not in text_lower:
+        return 0
+    
+    for pattern in _YOE_PATTERNS:
+        match = pattern.search(text_lower)
         if match:
             return int(match.group(1))
     
@@ -169,18 +268,57 @@ def detect_sections(text: str) -> dict:
     Detect common resume/job sections
     Returns dict with section presence
     """
-    text_lower = text.lower()
-    
-    sections = {
-        'summary': any(keyword in text_lower for keyword in ['summary', 'objective', 'profile']),
-        'experience': any(keyword in text_lower for keyword in ['experience', 'work history', 'employment']),
-        'education': any(keyword in text_lower for keyword in ['education', 'academic', 'degree']),
-        'skills': any(keyword in text_lower for keyword in ['skills', 'technical skills', 'competencies']),
-        'projects': any(keyword in text_lower for keyword in ['projects', 'portfolio']),
-        'certifications': any(keyword in text_lower for keyword in ['certifications', 'certificates', 'licensed'])
+    return dict(_detect_sections_cached(text))
+
+@lru_cache(maxsize=1024)
+def _detect_sections_cached(text: str) -> dict:
+    """detect_sections, memoized per text (callers get a copy)"""
+    return _detect_sections_lower(lower_text(text))
+
+def _detect_sections_lower(text_lower: str) -> dict:
+    """detect_sections on text that is already lowercased"""
+    return {
+        section: any(keyword in text_lower for keyword in keywords)
+        for section, keywords in _SECTION_KEYWORDS
     }
+
+# ==========================================
+# TEXT FEATURES
+# ==========================================
+
+@dataclass(frozen=True)
+class TextFeatures:
+    """Word count, sections and keywords of a document, computed together"""
+    word_count: int
+    sections: dict
+    keywords: tuple
+
+def analyze_text(text: str, top_n: int = 30) -> TextFeatures:
+    """
+    Compute the document features used by the ATS checks in one go
+    
+    Args:
+        text: Input text
+        top_n: Number of keywords to keep
     
-    return sections
+    Returns:
+        TextFeatures for the text
+    """
+    return TextFeatures(
+        word_count=get_word_count(text),
+        sections=detect_sections(text),
+        keywords=tuple(extract_keywords(text, top_n=top_n))
+    )
+
+# ==========================================
+# CACHES
+# ==========================================
+
+def clear_text_caches():
+    """Drop the memoized per-text results, e.g. between large batches"""
+    for cached in (lower_text, _extract_keywords_cached, _detect_sections_cached,
+                   extract_email, extract_phone, extract_years_of_experience):
+        cached.cache_clear()
 
 # ==========================================
 # TESTING
@@ -210,4 +348,5 @@ if __name__ == "__main__":
     print("Years:", extract_years_of_experience(sample))
     print("\nKeywords:", extract_keywords(sample)[:10])
     print("\nSections:", detect_sections(sample))
+    print("\nFeatures:", analyze_text(sample))
     print("\n✅ Text processor working!")
\ No newline at end of file
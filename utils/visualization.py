@@ -2,16 +2,110 @@
 Visualization - Create charts and graphs for results
 """
 
+from bisect import bisect_right
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
+import streamlit as st
 import sys
-sys.path.append('.')
+if '.' not in sys.path:
+    sys.path.append('.')
 from config.settings import CHART_HEIGHT, CHART_THEME
 
+# ==========================================
+# SCORE COLORS
+# ==========================================
+
+# Score thresholds (ascending) and the color for each band, lowest band first
+_MATCH_COLOR_BANDS = ((50, 70, 85), ("#ef4444", "#f97316", "#fbbf24", "#10b981"))  # Red, Orange, Yellow, Green
+_ATS_COLOR_BANDS = ((60, 80), ("#ef4444", "#fbbf24", "#10b981"))
+_BATCH_COLOR_BANDS = ((50, 70), ('#ef4444', '#fbbf24', '#10b981'))
+
+def _score_color(score: float, bands: tuple) -> str:
+    """Color of the band a score falls in (a score on a threshold takes the higher band)"""
+    thresholds, colors = bands
+    return colors[bisect_right(thresholds, score)]
+
+# ==========================================
+# STATIC FIGURE PARTS
+# ==========================================
+
+# Parts of the figures that do not depend on the inputs, built once. Figures
+# are created from a single dict so Plotly validates each property once,
+# instead of once in the constructor and again in update_layout
+
+_MATCH_GAUGE = {
+    'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "white"},
+    'bgcolor': "rgba(30, 41, 59, 0.5)",
+    'borderwidth': 2,
+    'bordercolor': "white",
+    'steps': [
+        {'range': [0, 50], 'color': 'rgba(239, 68, 68, 0.3)'},
+        {'range': [50, 70], 'color': 'rgba(249, 115, 22, 0.3)'},
+        {'range': [70, 85], 'color': 'rgba(251, 191, 36, 0.3)'},
+        {'range': [85, 100], 'color': 'rgba(16, 185, 129, 0.3)'}
+    ]
+}
+
+_MATCH_GAUGE_LAYOUT = {
+    'paper_bgcolor': 'rgba(0,0,0,0)',
+    'plot_bgcolor': 'rgba(0,0,0,0)',
+    'font': {'color': "white", 'family': "Arial"},
+    'height': 300
+}
+
+_BREAKDOWN_LAYOUT = {
+    'title': "Score Breakdown",
+    'yaxis_title': "Score (%)",
+    'yaxis': dict(range=[0, 110]),
+    'paper_bgcolor': 'rgba(0,0,0,0)',
+    'plot_bgcolor': 'rgba(30, 41, 59, 0.3)',
+    'font': {'color': "white"},
+    'height': CHART_HEIGHT,
+    'showlegend': False
+}
+
+_RADAR_LAYOUT = {
+    'polar': dict(
+        radialaxis=dict(
+            visible=True,
+            range=[0, 100],
+            tickfont=dict(color='white'),
+            gridcolor='rgba(255, 255, 255, 0.2)'
+        ),
+        angularaxis=dict(
+            tickfont=dict(color='white', size=12),
+            gridcolor='rgba(255, 255, 255, 0.2)'
+        ),
+        bgcolor='rgba(30, 41, 59, 0.3)'
+    ),
+    'showlegend': False,
+    'paper_bgcolor': 'rgba(0,0,0,0)',
+    'font': {'color': "white"},
+    'height': 400
+}
+
+_ATS_GAUGE = {
+    'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "white"},
+    'bgcolor': "rgba(30, 41, 59, 0.5)",
+    'steps': [
+        {'range': [0, 60], 'color': 'rgba(239, 68, 68, 0.3)'},
+        {'range': [60, 80], 'color': 'rgba(251, 191, 36, 0.3)'},
+        {'range': [80, 100], 'color': 'rgba(16, 185, 129, 0.3)'}
+    ]
+}
+
+_ATS_GAUGE_LAYOUT = {
+    'paper_bgcolor': 'rgba(0,0,0,0)',
+    'plot_bgcolor': 'rgba(0,0,0,0)',
+    'font': {'color': "white"},
+    'height': 250
+}
+
 # ==========================================
 # MATCH SCORE GAUGE
 # ==========================================
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def create_score_gauge(score: float, title: str = "Match Score") -> go.Figure:
     """
     Create gauge chart for match score
@@ -24,47 +118,28 @@ def create_score_gauge(score: float, title: str = "Match Score") -> go.Figure:
         Plotly figure
     """
     # Determine color
-    if score >= 85:
-        color = "#10b981"  # Green
-    elif score >= 70:
-        color = "#fbbf24"  # Yellow
-    elif score >= 50:
-        color = "#f97316"  # Orange
-    else:
-        color = "#ef4444"  # Red
-    
-    fig = go.Figure(go.Indicator(
-        mode="gauge+number+delta",
-        value=score,
-        domain={'x': [0, 1], 'y': [0, 1]},
-        title={'text': title, 'font': {'size': 24, 'color': 'white'}},
-        number={'font': {'size': 48, 'color': 'white'}},
-        gauge={
-            'axis': {'range': [None, 100], 'tickwidth': 1, 'tickcolor': "white"},
-            'bar': {'color': color},
-            'bgcolor': "rgba(30, 41, 59, 0.5)",
-            'borderwidth': 2,
-            'bordercolor': "white",
-            'steps': [
-                {'range': [0, 50], 'color': 'rgba(239, 68, 68, 0.3)'},
-                {'range': [50, 70], 'color': 'rgba(249, 115, 22, 0.3)'},
-                {'range': [70, 85], 'color': 'rgba(251, 191, 36, 0.3)'},
-                {'range': [85, 100], 'color': 'rgba(16, 185, 129, 0.3)'}
-            ],
-            'threshold': {
-                'line': {'color': "white", 'width': 4},
-                'thickness': 0.75,
-                'value': score
+    color = _score_color(score, _MATCH_COLOR_BANDS)
+    
+    fig = go.Figure({
+        'data': [{
+            'type': 'indicator',
+            'mode': "gauge+number+delta",
+            'value': score,
+            'domain': {'x': [0, 1], 'y': [0, 1]},
+            'title': {'text': title, 'font': {'size': 24, 'color': 'white'}},
+            'number': {'font': {'size': 48, 'color': 'white'}},
+            'gauge': {
+                **_MATCH_GAUGE,
+                'bar': {'color': color},
+                'threshold': {
+                    'line': {'color': "white", 'width': 4},
+                    'thickness': 0.75,
+                    'value': score
+                }
             }
-        }
-    ))
-    
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={'color': "white", 'family': "Arial"},
-        height=300
-    )
+        }],
+        'layout': _MATCH_GAUGE_LAYOUT
+    })
     
     return fig
 
@@ -72,6 +147,7 @@ def create_score_gauge(score: float, title: str = "Match Score") -> go.Figure:
 # SCORE BREAKDOWN BAR CHART
 # ==========================================
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def create_score_breakdown(semantic: float, skills: float, experience: float, education: float) -> go.Figure:
     """
     Create bar chart for score breakdown
@@ -89,27 +165,18 @@ def create_score_breakdown(semantic: float, skills: float, experience: float, ed
     scores = [semantic, skills, experience, education]
     colors = ['#3b82f6', '#10b981', '#f59e0b', '#8b5cf6']
     
-    fig = go.Figure(data=[
-        go.Bar(
-            x=categories,
-            y=scores,
-            text=[f'{s:.1f}%' for s in scores],
-            textposition='outside',
-            marker_color=colors,
-            hovertemplate='%{x}<br>Score: %{y:.1f}%<extra></extra>'
-        )
-    ])
-    
-    fig.update_layout(
-        title="Score Breakdown",
-        yaxis_title="Score (%)",
-        yaxis=dict(range=[0, 110]),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(30, 41, 59, 0.3)',
-        font={'color': "white"},
-        height=CHART_HEIGHT,
-        showlegend=False
-    )
+    fig = go.Figure({
+        'data': [{
+            'type': 'bar',
+            'x': categories,
+            'y': scores,
+            'text': [f'{s:.1f}%' for s in scores],
+            'textposition': 'outside',
+            'marker_color': colors,
+            'hovertemplate': '%{x}<br>Score: %{y:.1f}%<extra></extra>'
+        }],
+        'layout': _BREAKDOWN_LAYOUT
+    })
     
     return fig
 
@@ -117,6 +184,7 @@ def create_score_breakdown(semantic: float, skills: float, experience: float, ed
 # SKILLS COMPARISON
 # ==========================================
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def create_skills_comparison(matching_skills: list, missing_skills: list) -> go.Figure:
     """
     Create horizontal bar chart comparing skills
@@ -177,6 +245,7 @@ def create_skills_comparison(matching_skills: list, missing_skills: list) -> go.
 # RADAR CHART
 # ==========================================
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def create_radar_chart(semantic: float, skills: float, experience: float, education: float) -> go.Figure:
     """
     Create radar chart for multi-dimensional view
@@ -192,36 +261,18 @@ def create_radar_chart(semantic: float, skills: float, experience: float, educat
     """
     categories = ['Semantic<br>Match', 'Skills', 'Experience', 'Education']
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
-        r=[semantic, skills, experience, education],
-        theta=categories,
-        fill='toself',
-        name='Your Match',
-        line_color='#f59e0b',
-        fillcolor='rgba(245, 158, 11, 0.3)'
-    ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(
-                visible=True,
-                range=[0, 100],
-                tickfont=dict(color='white'),
-                gridcolor='rgba(255, 255, 255, 0.2)'
-            ),
-            angularaxis=dict(
-                tickfont=dict(color='white', size=12),
-                gridcolor='rgba(255, 255, 255, 0.2)'
-            ),
-            bgcolor='rgba(30, 41, 59, 0.3)'
-        ),
-        showlegend=False,
-        paper_bgcolor='rgba(0,0,0,0)',
-        font={'color': "white"},
-        height=400
-    )
+    fig = go.Figure({
+        'data': [{
+            'type': 'scatterpolar',
+            'r': [semantic, skills, experience, education],
+            'theta': categories,
+            'fill': 'toself',
+            'name': 'Your Match',
+            'line_color': '#f59e0b',
+            'fillcolor': 'rgba(245, 158, 11, 0.3)'
+        }],
+        'layout': _RADAR_LAYOUT
+    })
     
     return fig
 
@@ -229,6 +280,7 @@ def create_radar_chart(semantic: float, skills: float, experience: float, educat
 # ATS SCORE CHART
 # ==========================================
 
+@st.cache_data(show_spinner=False, max_entries=64)
 def create_ats_chart(ats_score: float) -> go.Figure:
     """
     Create progress bar for ATS score
@@ -240,36 +292,19 @@ def create_ats_chart(ats_score: float) -> go.Figure:
         Plotly figure
     """
     # Determine color
-    if ats_score >= 80:
-        color = "#10b981"
-    elif ats_score >= 60:
-        color = "#fbbf24"
-    else:
-        color = "#ef4444"
-    
-    fig = go.Figure(go.Indicator(
-        mode="number+gauge",
-        value=ats_score,
-        title={'text': "ATS Compatibility", 'font': {'size': 20, 'color': 'white'}},
-        number={'font': {'size': 36, 'color': 'white'}, 'suffix': '/100'},
-        gauge={
-            'axis': {'range': [0, 100], 'tickwidth': 1, 'tickcolor': "white"},
-            'bar': {'color': color},
-            'bgcolor': "rgba(30, 41, 59, 0.5)",
-            'steps': [
-                {'range': [0, 60], 'color': 'rgba(239, 68, 68, 0.3)'},
-                {'range': [60, 80], 'color': 'rgba(251, 191, 36, 0.3)'},
-                {'range': [80, 100], 'color': 'rgba(16, 185, 129, 0.3)'}
-            ]
-        }
-    ))
-    
-    fig.update_layout(
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font={'color': "white"},
-        height=250
-    )
+    color = _score_color(ats_score, _ATS_COLOR_BANDS)
+    
+    fig = go.Figure({
+        'data': [{
+            'type': 'indicator',
+            'mode': "number+gauge",
+            'value': ats_score,
+            'title': {'text': "ATS Compatibility", 'font': {'size': 20, 'color': 'white'}},
+            'number': {'font': {'size': 36, 'color': 'white'}, 'suffix': '/100'},
+            'gauge': {**_ATS_GAUGE, 'bar': {'color': color}}
+        }],
+        'layout': _ATS_GAUGE_LAYOUT
+    })
     
     return fig
 
@@ -282,19 +317,21 @@ def create_batch_results_chart(results: list) -> go.Figure:
     Create horizontal bar chart for batch matching results
     
     Args:
-        results: List of match results (top 10)
+        results: List of match results (the 10 best scores are shown, ties
+            in list order, so already-sorted results keep their order)
     
     Returns:
         Plotly figure
     """
     # Limit to top 10
-    top_results = results[:10]
+    scores = np.fromiter((r['total_score'] for r in results), dtype=np.float64, count=len(results))
+    top_results = [results[i] for i in _top_score_indices(scores, 10)]
     
-    job_titles = [r['job'].get('title', f"Job {r['job_index']}") for r in top_results]
+    job_titles = [r['job'].title or f"Job {r['job_index']}" for r in top_results]
     scores = [r['total_score'] for r in top_results]
     
     # Color based on score
-    colors = ['#10b981' if s >= 70 else '#fbbf24' if s >= 50 else '#ef4444' for s in scores]
+    colors = [_score_color(s, _BATCH_COLOR_BANDS) for s in scores]
     
     fig = go.Figure(data=[
         go.Bar(
@@ -322,6 +359,21 @@ def create_batch_results_chart(results: list) -> go.Figure:
     
     return fig
 
+def _top_score_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, using a partial partition
+    
+    Equal scores keep their original order
+    """
+    if len(scores) > k:
+        # Score of the k-th best result; only results at or above it can make the cut
+        cutoff = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= cutoff)
+    else:
+        candidates = np.arange(len(scores))
+    
+    return candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+
 # ==========================================
 # TESTING
 # ==========================================